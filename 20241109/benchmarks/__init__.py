@@ -0,0 +1,2 @@
+# benchmarks
+# 성능 측정 스크립트 모음 (20241109 폴더에서 python -m benchmarks.<모듈> 로 실행)
@@ -0,0 +1,99 @@
+# benchmarks/bench_connection.py
+# 호출마다 새 연결을 여는 방식과 연결 풀 방식의 호출당 지연시간 비교
+# 실행: 20241109 폴더에서 python -m benchmarks.bench_connection
+import os
+import sqlite3
+import tempfile
+import time
+import pandas as pd
+import db
+
+ROUNDS = 500
+SEED_EVENTS = 1000
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS events
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     title TEXT NOT NULL,
+     start_date DATE NOT NULL,
+     end_date DATE NOT NULL,
+     color TEXT,
+     description TEXT)
+'''
+
+SAMPLE = ('벤치마크 일정', '2024-11-10', '2024-11-15', '#FF6B6B', '벤치마크용 일정입니다.')
+
+# 기존 구현 (호출마다 connect/commit/close)
+def legacy_add_event(path, title, start_date, end_date, color, description=""):
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute('''
+        INSERT INTO events (title, start_date, end_date, color, description)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (title, start_date, end_date, color, description))
+    conn.commit()
+    conn.close()
+
+def legacy_get_all_events(path):
+    conn = sqlite3.connect(path)
+    df = pd.read_sql_query("SELECT * FROM events", conn)
+    conn.close()
+    return df
+
+def legacy_update_event(path, event_id, title, start_date, end_date, color, description):
+    conn = sqlite3.connect(path)
+    c = conn.cursor()
+    c.execute('''
+        UPDATE events
+        SET title = ?, start_date = ?, end_date = ?, color = ?, description = ?
+        WHERE id = ?
+    ''', (title, start_date, end_date, color, description, event_id))
+    conn.commit()
+    conn.close()
+
+def seed(path):
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.executemany('''
+        INSERT INTO events (title, start_date, end_date, color, description)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [SAMPLE] * SEED_EVENTS)
+    conn.commit()
+    conn.close()
+
+def measure(func, rounds=ROUNDS):
+    start = time.perf_counter()
+    for i in range(rounds):
+        func(i)
+    return (time.perf_counter() - start) / rounds * 1000
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, 'legacy.db')
+        pooled_path = os.path.join(tmp, 'pooled.db')
+        seed(legacy_path)
+        seed(pooled_path)
+
+        legacy = {
+            'add_event': measure(lambda i: legacy_add_event(legacy_path, *SAMPLE)),
+            'update_event': measure(lambda i: legacy_update_event(legacy_path, i % SEED_EVENTS + 1, *SAMPLE)),
+            'get_all_events': measure(lambda i: legacy_get_all_events(legacy_path), rounds=ROUNDS // 10),
+        }
+
+        db.DB_PATH = pooled_path
+        try:
+            pooled = {
+                'add_event': measure(lambda i: db.add_event(*SAMPLE)),
+                'update_event': measure(lambda i: db.update_event(i % SEED_EVENTS + 1, *SAMPLE)),
+                # 조회 캐시를 거치지 않은 순수 조회 시간
+                'get_all_events': measure(lambda i: db.get_all_events.__wrapped__(), rounds=ROUNDS // 10),
+            }
+        finally:
+            db.close_all_connections()
+
+    print(f"{'함수':<16}{'기존(ms)':>12}{'연결 풀(ms)':>14}{'배율':>8}")
+    for name in legacy:
+        print(f"{name:<16}{legacy[name]:>12.3f}{pooled[name]:>14.3f}{legacy[name] / pooled[name]:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
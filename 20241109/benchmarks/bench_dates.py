@@ -0,0 +1,62 @@
+# benchmarks/bench_dates.py
+# TEXT 날짜 파싱과 정수 일수 컬럼 변환의 시간 비교, 기간 조회의 TEXT/정수 비교
+# 실행: 20241109 폴더에서 python -m benchmarks.bench_dates [일정 수]
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+import db
+from benchmarks.dataset import create_dataset
+
+DEFAULT_EVENTS = 200000
+REPEAT = 5
+
+def best_of(func, repeat=REPEAT):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def parse_text(events_df):
+    start = pd.to_datetime(events_df['start_date']).to_numpy().astype('datetime64[D]')
+    end = pd.to_datetime(events_df['end_date']).to_numpy().astype('datetime64[D]')
+    return start, end
+
+def convert_days(events_df):
+    start = events_df['start_day'].to_numpy().astype('datetime64[D]')
+    end = events_df['end_day'].to_numpy().astype('datetime64[D]')
+    return start, end
+
+def range_query(integer_dates, first_date):
+    db.INTEGER_DATES = integer_dates
+    year, month = first_date[:4], first_date[5:7]
+    return db.get_events_in_range.__wrapped__(f'{year}-{month}-01', f'{year}-{month}-28')
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS
+    with tempfile.TemporaryDirectory() as tmp:
+        path = create_dataset(os.path.join(tmp, 'bench.db'), count)
+        db.DB_PATH = path
+        integer_dates = db.INTEGER_DATES
+        try:
+            events_df = db.get_all_events.__wrapped__()
+            first_date, _ = db.get_date_bounds.__wrapped__()
+            results = {
+                '날짜 파싱 (pd.to_datetime)': best_of(lambda: parse_text(events_df)),
+                '정수 일수 → datetime64[D]': best_of(lambda: convert_days(events_df)),
+                '월 기간 조회 (TEXT 비교)': best_of(lambda: range_query(False, first_date)),
+                '월 기간 조회 (정수 비교)': best_of(lambda: range_query(True, first_date)),
+            }
+        finally:
+            db.INTEGER_DATES = integer_dates
+            db.close_all_connections()
+
+    print(f"일정 {count:,}건, {REPEAT}회 중 최솟값")
+    for name, elapsed in results.items():
+        print(f"{name:<28}{elapsed:>10.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_export.py
+# 기존 내보내기(DataFrame 전체 → BytesIO/StringIO)와 스트리밍 내보내기의 시간/최대 메모리 비교
+# 실행: 20241109 폴더에서 python -m benchmarks.bench_export [일정 수]
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+import db
+from export import COLOR_NAMES, DEFAULT_COLOR_NAME, export_to_tempfile
+
+DEFAULT_EVENTS = 50000
+COLORS = list(COLOR_NAMES)
+
+def seed(count):
+    db.init_db()
+    db.add_events_bulk(
+        (
+            f'벤치마크 일정 {i}',
+            f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            f'2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+            COLORS[i % len(COLORS)],
+            f'내보내기 성능 측정용 설명 {i}'
+        )
+        for i in range(count)
+    )
+
+# 기존 다운로드 탭 구현 (엑셀 + CSV를 모두 메모리에서 생성)
+def legacy_export():
+    events_df = db.get_all_events.__wrapped__()
+    export_df = events_df.copy()
+    export_df['color'] = export_df['color'].apply(lambda c: COLOR_NAMES.get(c, DEFAULT_COLOR_NAME))
+    excel_buffer = io.BytesIO()
+    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+        export_df = export_df[['title', 'start_date', 'end_date', 'color', 'description']]
+        export_df.to_excel(writer, index=False, sheet_name='Events')
+    csv_buffer = io.StringIO()
+    export_df.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
+    return len(excel_buffer.getvalue()) + len(csv_buffer.getvalue().encode('utf-8-sig'))
+
+def streaming_export():
+    size = 0
+    for fmt in ('xlsx', 'csv'):
+        path, _ = export_to_tempfile(fmt)
+        size += os.path.getsize(path)
+        os.remove(path)
+    return size
+
+def measure(func):
+    # tracemalloc은 실행을 크게 느리게 하므로 시간과 메모리는 따로 측정
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        try:
+            seed(count)
+            results = {
+                '기존': measure(legacy_export),
+                '스트리밍': measure(streaming_export),
+            }
+        finally:
+            db.close_all_connections()
+
+    print(f"일정 {count:,}건 (엑셀 + CSV)")
+    print(f"{'방식':<10}{'시간(s)':>10}{'최대 메모리(MB)':>18}{'파일 크기(MB)':>16}")
+    for name, (elapsed, peak, size) in results.items():
+        print(f"{name:<10}{elapsed:>10.2f}{peak / 1024 ** 2:>18.1f}{size / 1024 ** 2:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_imports.py
+# 페이지 진입점별 import 시간 분석 (python -X importtime)
+# 페이지 스크립트의 최상위 import 문만 새 프로세스에서 실행하므로 Streamlit 서버 없이 측정
+# 모든 페이지가 공통으로 쓰는 streamlit 자체의 import 시간은 따로 빼서 표시
+# 실행: 20241109 폴더에서 python -m benchmarks.bench_imports [--repeat 5] [--top 5]
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ['home.py'] + sorted(
+    os.path.join('pages', name) for name in os.listdir(os.path.join(ROOT, 'pages')) if name.endswith('.py')
+)
+BASELINE = 'import streamlit'
+
+# "import time: self [us] | cumulative | 패키지" (하위 import는 이름 앞에 공백 2칸씩 들여씀)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$', re.MULTILINE)
+
+def top_level_imports(path):
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(
+        ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+def profile(code, repeat):
+    # 가장 빠른 실행의 (전체 ms, 최상위 패키지별 self ms 합계)
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        total = 0.0
+        packages = defaultdict(float)
+        for self_us, cumulative_us, indent, name in IMPORTTIME_LINE.findall(result.stderr):
+            packages[name.split('.')[0]] += int(self_us) / 1000
+            if not indent:
+                total += int(cumulative_us) / 1000
+        if best is None or total < best[0]:
+            best = (total, packages)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별 import 시간 분석")
+    parser.add_argument('--repeat', type=int, default=5, help="페이지마다 실행할 횟수 (가장 빠른 값 사용)")
+    parser.add_argument('--top', type=int, default=5, help="페이지마다 표시할 무거운 패키지 수")
+    args = parser.parse_args()
+
+    base_total, base_packages = profile(BASELINE, args.repeat)
+    print(f"streamlit 자체: {base_total:.0f}ms (아래 시간에서 제외)")
+    print(f"{'진입점':<32}{'import(ms)':>12}  무거운 패키지 (ms)")
+    for path in ENTRY_POINTS:
+        total, packages = profile(f'{BASELINE}\n{top_level_imports(path)}', args.repeat)
+        extra = {
+            name: ms - base_packages.get(name, 0.0)
+            for name, ms in packages.items()
+            if ms - base_packages.get(name, 0.0) > 0.5
+        }
+        heaviest = sorted(extra.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(
+            f"{path:<32}{total - base_total:>12.0f}  "
+            + ", ".join(f"{name} {ms:.0f}" for name, ms in heaviest)
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_writes.py
+# 여러 세션이 동시에 쓰는 상황에서 쓰기 처리량/지연시간/잠금 오류 비교
+# 기존 방식(호출마다 연결을 열고 바로 커밋)과 쓰기 전용 스레드(그룹 커밋) 방식
+# 실행: 20241109 폴더에서 python -m benchmarks.bench_writes [--threads 8] [--writes 200]
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import db
+from benchmarks.dataset import generate_events
+
+SAMPLE = ('벤치마크 일정', '2024-11-10', '2024-11-15', '#FF6B6B', '동시 쓰기 측정용 일정입니다.')
+IMPORT_ROWS = 20000     # 측정 중 함께 실행하는 CSV 가져오기 크기
+LEGACY_TIMEOUT = 5.0    # sqlite3.connect 기본값
+
+def legacy_add_event(path, timeout):
+    conn = sqlite3.connect(path, timeout=timeout)
+    try:
+        conn.execute('''
+            INSERT INTO events (title, start_date, end_date, color, description)
+            VALUES (?, ?, ?, ?, ?)
+        ''', SAMPLE)
+        conn.commit()
+    finally:
+        conn.close()
+
+def legacy_import(path, rows, timeout):
+    conn = sqlite3.connect(path, timeout=timeout)
+    try:
+        for i in range(0, len(rows), db.BULK_BATCH_SIZE):
+            conn.executemany('''
+                INSERT INTO events (title, start_date, end_date, color, description)
+                VALUES (?, ?, ?, ?, ?)
+            ''', rows[i:i + db.BULK_BATCH_SIZE])
+            conn.commit()
+    finally:
+        conn.close()
+
+def run_case(name, add_one, bulk_import, threads, writes):
+    # threads개 스레드가 writes번씩 한 건 등록, 동시에 한 스레드는 대량 가져오기
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads + 2)
+
+    def session():
+        local_latencies, local_errors = [], 0
+        start_barrier.wait()
+        for _ in range(writes):
+            t0 = time.perf_counter()
+            try:
+                add_one()
+            except sqlite3.OperationalError:
+                local_errors += 1
+                continue
+            local_latencies.append((time.perf_counter() - t0) * 1000)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    def importer():
+        start_barrier.wait()
+        try:
+            bulk_import()
+        except sqlite3.OperationalError:
+            with lock:
+                errors.append(1)
+
+    workers = [threading.Thread(target=session) for _ in range(threads)]
+    workers.append(threading.Thread(target=importer))
+    for worker in workers:
+        worker.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'name': name,
+        'writes': len(latencies),
+        'errors': sum(errors),
+        'elapsed_s': elapsed,
+        'writes_per_s': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 쓰기 성능/잠금 오류 비교")
+    parser.add_argument('--threads', type=int, default=8, help="동시에 일정을 등록하는 세션 수")
+    parser.add_argument('--writes', type=int, default=200, help="세션당 등록 횟수")
+    parser.add_argument('--timeout', type=float, default=LEGACY_TIMEOUT, help="기존 방식의 잠금 대기 시간(초)")
+    args = parser.parse_args()
+
+    rows = list(generate_events(IMPORT_ROWS).itertuples(index=False, name=None))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, 'bench.db')
+        try:
+            db.init_db()
+            path = db.get_pool().path
+            results.append(run_case(
+                '기존 (연결마다 커밋)',
+                lambda: legacy_add_event(path, args.timeout),
+                lambda: legacy_import(path, rows, args.timeout),
+                args.threads, args.writes
+            ))
+            writer = db.get_pool().writer()
+            commits_before, jobs_before = writer.commits, writer.jobs_done
+            results.append(run_case(
+                '쓰기 스레드 (그룹 커밋)',
+                lambda: db.add_event(*SAMPLE),
+                lambda: db.add_events_bulk(rows),
+                args.threads, args.writes
+            ))
+            jobs = writer.jobs_done - jobs_before
+            commits = writer.commits - commits_before
+        finally:
+            db.close_all_connections()
+
+    print(f"세션 {args.threads}개 × {args.writes}건 + 대량 가져오기 {IMPORT_ROWS:,}행")
+    print(f"{'방식':<22}{'성공':>8}{'오류':>6}{'처리량(건/s)':>14}{'p50(ms)':>10}{'p95(ms)':>10}")
+    for r in results:
+        print(f"{r['name']:<22}{r['writes']:>8}{r['errors']:>6}{r['writes_per_s']:>14.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}")
+    print(f"쓰기 스레드: 작업 {jobs:,}개를 {commits:,}번 커밋 (커밋당 평균 {jobs / max(commits, 1):.1f}개)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/dataset.py
+# 벤치마크용 합성 일정 데이터 생성
+# 실행: 20241109 폴더에서 python -m benchmarks.dataset --events 100000 --output bench.db
+import argparse
+import os
+import numpy as np
+import pandas as pd
+import db
+
+# 색상 코드와 출현 비율
+COLORS = ["#FF6B6B", "#45B7D1", "#4ECDC4", "#845EC2", "#FF9671"]
+COLOR_WEIGHTS = [0.35, 0.25, 0.2, 0.1, 0.1]
+
+TITLES = [
+    "주간 회의", "고객사 미팅", "시스템 점검", "프로젝트 킥오프", "코드 리뷰",
+    "정기 배포", "팀 워크숍", "신입 교육", "해외 출장", "분기 보고서 작성",
+    "디자인 검토", "보안 감사", "서버 이전", "채용 면접", "성과 평가",
+]
+
+DESCRIPTION_SUBJECTS = ["개발팀", "기획팀", "디자인팀", "운영팀", "영업팀", "경영지원팀"]
+DESCRIPTION_ACTIONS = [
+    "진행 상황 공유", "일정 조율", "요구사항 정리", "결과 보고", "이슈 점검",
+    "계획 수립", "자료 준비", "피드백 반영",
+]
+
+START_DATE = '2023-01-01'
+SPAN_DAYS = 3 * 365
+
+def generate_events(count, seed=0, start_date=START_DATE, span_days=SPAN_DAYS):
+    # 일정 count개를 DataFrame으로 생성 (title, start_date, end_date, color, description)
+    rng = np.random.default_rng(seed)
+
+    # 시작일: 기간 전체에 고르게 퍼지되 주말에는 일정이 적게 잡히도록 일부를 평일로 이동
+    offsets = rng.integers(0, span_days, count)
+    start = np.datetime64(start_date, 'D') + offsets
+    weekday = (start.astype(np.int64) - 4) % 7     # 0 = 월요일 (1970-01-01은 목요일)
+    weekend = (weekday >= 5) & (rng.random(count) < 0.7)
+    start[weekend] -= (weekday[weekend] - 4)
+
+    # 기간: 대부분 하루, 일부는 며칠, 소수는 몇 달짜리 프로젝트
+    kind = rng.random(count)
+    duration = np.where(
+        kind < 0.6, 0,
+        np.where(kind < 0.95, rng.geometric(0.3, count), rng.integers(30, 180, count))
+    )
+    end = start + duration
+
+    title_idx = rng.integers(0, len(TITLES), count)
+    subject_idx = rng.integers(0, len(DESCRIPTION_SUBJECTS), count)
+    action_idx = rng.integers(0, len(DESCRIPTION_ACTIONS), count)
+    titles = np.array(TITLES, dtype=object)[title_idx] + ' ' + (np.arange(count) + 1).astype(str).astype(object)
+    descriptions = (
+        np.array(DESCRIPTION_SUBJECTS, dtype=object)[subject_idx] + ' '
+        + np.array(DESCRIPTION_ACTIONS, dtype=object)[action_idx]
+    )
+
+    return pd.DataFrame({
+        'title': titles,
+        'start_date': np.datetime_as_string(start, unit='D'),
+        'end_date': np.datetime_as_string(end, unit='D'),
+        'color': rng.choice(COLORS, count, p=COLOR_WEIGHTS),
+        'description': descriptions,
+    })
+
+def create_dataset(path, count, seed=0):
+    # path에 새 calendar.db를 만들고 합성 일정 count개를 채움
+    if os.path.exists(path):
+        os.remove(path)
+    previous_path = db.DB_PATH
+    db.DB_PATH = path
+    try:
+        db.init_db()
+        events_df = generate_events(count, seed=seed)
+        db.add_events_bulk(events_df.itertuples(index=False, name=None))
+    finally:
+        db.close_all_connections()
+        db.DB_PATH = previous_path
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 calendar.db 생성")
+    parser.add_argument('--events', type=int, default=10000, help="생성할 일정 수 (1,000 ~ 1,000,000)")
+    parser.add_argument('--output', default='bench.db', help="생성할 DB 파일 경로")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    create_dataset(args.output, args.events, seed=args.seed)
+    print(f"{args.output}: 일정 {args.events:,}건 생성")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# benchmarks/run.py
+# 주요 처리 경로 성능 측정 (결과는 JSON으로 출력해 릴리스 간 비교에 사용)
+# 실행: 20241109 폴더에서 python -m benchmarks.run --sizes 1000 10000 100000 --output results.json
+import argparse
+import calendar
+import io
+import json
+import logging
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime
+import db
+import gantt
+import calendar_image
+import conflicts
+import interval_index
+from benchmarks.dataset import create_dataset, generate_events
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 5
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pages')
+
+class UploadedBytes(io.BytesIO):
+    # st.file_uploader가 돌려주는 UploadedFile 흉내 (name, size 속성)
+    def __init__(self, data, name='events.csv'):
+        super().__init__(data)
+        self.name = name
+
+    @property
+    def size(self):
+        return len(self.getbuffer())
+
+def load_page(file_name):
+    # 페이지 스크립트의 함수만 가져옴 (main은 실행하지 않음)
+    return runpy.run_path(os.path.join(PAGES_DIR, file_name), run_name='benchmark')
+
+def timed(func, repeat, setup=None):
+    # repeat번 실행한 시간(ms) 목록, setup은 측정에서 제외
+    samples = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+def summarize(name, size, samples):
+    return {
+        'name': name,
+        'events': size,
+        'repeat': len(samples),
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'max_ms': round(max(samples), 3),
+    }
+
+def bench_db(size, repeat):
+    # db.py 함수별 (조회 캐시를 거치지 않은 시간과 캐시 적중 시간)
+    first_date, last_date = db.get_date_bounds.__wrapped__()
+    year, month = int(first_date[:4]), int(first_date[5:7])
+    month_start = f"{year}-{month:02d}-01"
+    month_end = f"{year}-{month:02d}-{calendar.monthrange(year, month)[1]:02d}"
+    sample = ('벤치마크 일정', first_date, first_date, '#FF6B6B', '벤치마크 설명')
+
+    def add_event():
+        db.add_event(*sample)
+
+    def update_event():
+        db.update_event(1, *sample)
+
+    def delete_event(event_id):
+        db.delete_event(event_id)
+
+    def next_id():
+        db.add_event(*sample)
+        with db.connect() as conn:
+            return (conn.execute('SELECT MAX(id) FROM events').fetchone()[0],)
+
+    def iter_all():
+        for _ in db.iter_events():
+            pass
+
+    def build_index():
+        with db.connect() as conn:
+            return interval_index.load_interval_index(conn)
+
+    index = build_index()
+
+    def warm_cache():
+        db.get_all_events()
+        return ()
+
+    cases = {
+        'db.add_event': (add_event, None),
+        'db.update_event': (update_event, None),
+        'db.delete_event': (delete_event, next_id),
+        'db.add_events_bulk[1000]': (lambda: db.add_events_bulk([sample] * 1000), None),
+        'db.update_events[month]': (lambda: db.update_events({'color': '#45B7D1'}, start=month_start, end=month_end), None),
+        'db.get_all_events': (db.get_all_events.__wrapped__, None),
+        'db.get_all_events[cached]': (db.get_all_events, warm_cache),
+        'db.get_events_in_range[month]': (lambda: db.get_events_in_range.__wrapped__(month_start, month_end), None),
+        'db.get_date_bounds': (db.get_date_bounds.__wrapped__, None),
+        'db.get_event_stats': (lambda: db.get_event_stats.__wrapped__(first_date), None),
+        'db.query_events[page]': (lambda: db.query_events.__wrapped__(sort_by='start_date', ascending=False), None),
+        'db.search_events[fts]': (lambda: db.search_events.__wrapped__('주간 회의', first_date, last_date), None),
+        'db.search_events[like]': (lambda: db.search_events.__wrapped__('회의', first_date, last_date), None),
+        'db.iter_events[all]': (iter_all, None),
+        'interval_index.build': (build_index, None),
+        'interval_index.at[day]': (lambda: index.at(first_date), None),
+        'interval_index.overlapping[month]': (lambda: index.overlapping(month_start, month_end), None),
+    }
+    # 테이블 전체를 읽는 항목은 오래 걸리므로 반복 횟수를 줄임
+    full_scans = {'db.get_all_events', 'db.iter_events[all]', 'interval_index.build'}
+    results = []
+    for name, (func, setup) in cases.items():
+        rounds = max(1, repeat // 2) if name in full_scans else repeat
+        results.append(summarize(name, size, timed(func, rounds, setup)))
+    return results
+
+def bench_pages(size, repeat):
+    results = []
+    events_df = db.get_all_events.__wrapped__()
+
+    # pages/3_csv_import.py: 업로드 파일 파싱/검증/일괄 등록 (1,000행 파일)
+    csv_import = load_page('3_csv_import.py')
+    csv_df = generate_events(1000, seed=1)
+    csv_df['color'] = '빨간색'
+    csv_bytes = csv_df.to_csv(index=False).encode('utf-8')
+    samples = timed(lambda f: csv_import['import_events'](f), repeat, setup=lambda: (UploadedBytes(csv_bytes),))
+    results.append(summarize('pages.csv_import.import_csv[1000 rows]', size, samples))
+    parquet_buffer = io.BytesIO()
+    csv_df.to_parquet(parquet_buffer, index=False)
+    parquet_bytes = parquet_buffer.getvalue()
+    samples = timed(
+        lambda f: csv_import['import_events'](f), repeat,
+        setup=lambda: (UploadedBytes(parquet_bytes, 'events.parquet'),)
+    )
+    results.append(summarize('pages.csv_import.import_parquet[1000 rows]', size, samples))
+    # 같은 파일을 다시 올리는 경우 (첫 반복 이후에는 모두 건너뜀)
+    samples = timed(
+        lambda f: csv_import['import_events'](f, 'upsert'), repeat,
+        setup=lambda: (UploadedBytes(csv_bytes),)
+    )
+    results.append(summarize('pages.csv_import.import_upsert[1000 rows]', size, samples))
+
+    # pages/2_Gantt.py: 간트 데이터 준비 + 자동 모드 figure 생성
+    samples = timed(lambda: gantt.prepare_gantt_data(events_df), repeat)
+    results.append(summarize('gantt.prepare_gantt_data', size, samples))
+    gantt_df = gantt.prepare_gantt_data(events_df)
+    samples = timed(lambda: conflicts.analyze_schedule(events_df), repeat)
+    results.append(summarize('conflicts.analyze_schedule', size, samples))
+    samples = timed(lambda: gantt.build_gantt_figure(gantt_df), repeat)
+    results.append(summarize('gantt.build_gantt_figure[auto]', size, samples))
+
+    # pages/1_Calendar.py: 캘린더 컴포넌트용 일정 목록 생성
+    calendar_page = load_page('1_Calendar.py')
+    samples = timed(lambda: calendar_page['build_calendar_events'](events_df), max(1, repeat // 2))
+    results.append(summarize('pages.calendar.build_calendar_events', size, samples))
+    first_date, _ = db.get_date_bounds.__wrapped__()
+    year, month = int(first_date[:4]), int(first_date[5:7])
+    samples = timed(
+        lambda: calendar_page['build_calendar_events'](calendar_page['load_month_events'](year, month)),
+        repeat
+    )
+    results.append(summarize('pages.calendar.month_payload', size, samples))
+
+    # pages/4_event_management.py: 월간 캘린더 이미지 figure 생성
+    samples = timed(lambda: calendar_image.create_calendar_image(events_df, year, month), repeat)
+    results.append(summarize('calendar_image.create_calendar_image[all events]', size, samples))
+    month_df = db.get_events_in_range.__wrapped__(
+        f"{year}-{month:02d}-01",
+        f"{year}-{month:02d}-{calendar.monthrange(year, month)[1]:02d}"
+    )
+    samples = timed(lambda: calendar_image.create_calendar_image(month_df, year, month), repeat)
+    results.append(summarize('calendar_image.create_calendar_image[month]', size, samples))
+    return results
+
+def run(sizes, repeat, workdir):
+    results = []
+    previous_path = db.DB_PATH
+    for size in sizes:
+        path = os.path.join(workdir, f'bench_{size}.db')
+        create_dataset(path, size)
+        db.DB_PATH = path
+        try:
+            results.extend(bench_db(size, repeat))
+            results.extend(bench_pages(size, repeat))
+            # 마지막으로 전체 삭제 (DB를 비우므로 한 번만)
+            results.append(summarize('db.delete_all_events', size, timed(db.delete_all_events, 1)))
+        finally:
+            db.close_all_connections()
+            db.DB_PATH = previous_path
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="캘린더 앱 성능 측정")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="데이터셋 일정 수 목록")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="항목별 반복 횟수")
+    parser.add_argument('--output', help="결과 JSON 파일 경로 (생략하면 표준 출력)")
+    args = parser.parse_args()
+
+    # 페이지 함수를 Streamlit 밖에서 호출할 때 나오는 경고 숨김
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    workdir = tempfile.mkdtemp(prefix='calendar_bench_')
+    try:
+        results = run(args.sizes, args.repeat, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': db.sqlite3.sqlite_version,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# calendar_image.py
+# 월간 캘린더 이미지 생성 (Plotly figure / PNG 렌더링, 결과 캐시, 연간 ZIP)
+import calendar
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import plotly.graph_objects as go
+import db
+from occupancy import build_month_occupancy
+from timing import traced
+
+# 이미지 크기 (픽셀, scale배로 저장)
+IMAGE_WIDTH = 800
+IMAGE_HEIGHT = 600
+IMAGE_SCALE = 2
+
+# 렌더링된 PNG를 보관할 최대 개수 (년, 월, 렌더러, 데이터 버전별)
+IMAGE_CACHE_SIZE = 48
+
+# 연간 이미지 생성 시 사용할 프로세스 수
+YEAR_EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+
+RENDERERS = {
+    'kaleido': 'Plotly (Kaleido)',
+    'raster': '빠른 렌더링 (Pillow)',
+}
+
+WEEKDAYS = ['일', '월', '화', '수', '목', '금', '토']
+
+# 한글을 표시할 수 있는 글꼴 후보 (앞에서부터 처음 찾은 것을 사용)
+FONT_CANDIDATES = [
+    'C:/Windows/Fonts/malgun.ttf',
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',
+    '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+    '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+    '/System/Library/Fonts/AppleSDGothicNeo.ttc',
+]
+
+@traced
+def create_calendar_image(events_df, year, month):
+    # 달력 데이터 준비
+    cal = calendar.monthcalendar(year, month)
+    
+    # Plotly figure 생성
+    fig = go.Figure()
+    
+    # 테이블 데이터 준비
+    table_data = []
+    colors = []
+    
+    # 요일 헤더
+    weekdays = ['일', '월', '화', '수', '목', '금', '토']
+    table_data.append(weekdays)
+    colors.append(['rgb(255,0,0)' if d == '일' else 'rgb(0,0,255)' if d == '토' else 'black' for d in weekdays])
+    
+    # 날짜별 일정 제목 (한 번에 매핑)
+    occupancy = build_month_occupancy(events_df, year, month)
+    titles = events_df['title']
+    
+    # 달력 데이터와 이벤트 매핑
+    for week in cal:
+        week_data = []
+        week_colors = []
+        for i, day in enumerate(week):
+            if day == 0:
+                cell_content = ""
+                cell_color = 'white'
+            else:
+                day_events = occupancy[day]
+                
+                # 날짜와 이벤트 텍스트 결합
+                cell_content = f"{day}\n"
+                if day_events:
+                    events_text = "\n".join([f"• {title}" for title in titles.loc[day_events]])
+                    cell_content += events_text
+                
+                # 주말 색상 설정
+                cell_color = 'rgb(255,0,0)' if i == 0 else 'rgb(0,0,255)' if i == 6 else 'black'
+            
+            week_data.append(cell_content)
+            week_colors.append(cell_color)
+        
+        table_data.append(week_data)
+        colors.append(week_colors)
+    
+    # Plotly 테이블 생성
+    fig.add_trace(
+        go.Table(
+            header=dict(
+                values=[f'<b>{day}</b>' for day in weekdays],
+                line_color='white',
+                fill_color='lightgrey',
+                align='center',
+                font=dict(size=14, color=colors[0])
+            ),
+            cells=dict(
+                values=[[row[i] for row in table_data[1:]] for i in range(7)],
+                line_color='white',
+                fill_color='white',
+                align='center',
+                height=80,
+                font=dict(size=12),
+                font_color=[[colors[i+1][j] for i in range(len(table_data)-1)] for j in range(7)]
+            )
+        )
+    )
+    
+    # 레이아웃 설정
+    fig.update_layout(
+        title=dict(
+            text=f'{year}년 {month}월',
+            x=0.5,
+            font=dict(size=24)
+        ),
+        width=800,
+        height=600,
+        margin=dict(l=20, r=20, t=60, b=20)
+    )
+    
+    return fig
+
+def get_month_events(year, month):
+    # 해당 월과 겹치는 일정만 조회
+    last_day = calendar.monthrange(year, month)[1]
+    return db.get_events_in_range(
+        f"{year}-{month:02d}-01",
+        f"{year}-{month:02d}-{last_day:02d}"
+    )
+
+def _load_font(size):
+    from PIL import ImageFont
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return ImageFont.truetype(path, size)
+    # 한글 글꼴이 없으면 기본 글꼴 사용 (한글이 깨질 수 있음)
+    return ImageFont.load_default(size)
+
+def _fit_text(draw, text, font, max_width):
+    # 셀 너비를 넘는 텍스트는 말줄임표로 자름
+    if draw.textlength(text, font=font) <= max_width:
+        return text
+    while text and draw.textlength(text + '…', font=font) > max_width:
+        text = text[:-1]
+    return text + '…'
+
+@traced
+def render_raster_png(events_df, year, month, scale=IMAGE_SCALE):
+    # Kaleido(브라우저 프로세스) 없이 Pillow로 create_calendar_image와 같은 배치를 직접 그림
+    from PIL import Image, ImageDraw
+
+    width, height = IMAGE_WIDTH * scale, IMAGE_HEIGHT * scale
+    margin, title_height, header_height = 20 * scale, 60 * scale, 30 * scale
+    image = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(image)
+    title_font = _load_font(24 * scale)
+    header_font = _load_font(14 * scale)
+    cell_font = _load_font(12 * scale)
+    line_height = int(cell_font.size * 1.4)
+
+    draw.text((width / 2, title_height / 2 + margin / 2), f'{year}년 {month}월',
+              font=title_font, fill='black', anchor='mm')
+
+    weeks = calendar.monthcalendar(year, month)
+    cell_width = (width - 2 * margin) / 7
+    top = margin + title_height - margin
+    row_height = (height - top - header_height - margin) / len(weeks)
+    weekday_colors = ['rgb(255,0,0)'] + ['black'] * 5 + ['rgb(0,0,255)']
+
+    # 요일 헤더
+    draw.rectangle([margin, top, width - margin, top + header_height], fill='lightgrey')
+    for i, name in enumerate(WEEKDAYS):
+        draw.text((margin + cell_width * (i + 0.5), top + header_height / 2), name,
+                  font=header_font, fill=weekday_colors[i], anchor='mm')
+
+    # 날짜 셀
+    occupancy = build_month_occupancy(events_df, year, month)
+    titles = events_df['title']
+    max_lines = max(int(row_height // line_height) - 1, 0)
+    for row, week in enumerate(weeks):
+        y = top + header_height + row * row_height
+        draw.line([margin, y, width - margin, y], fill='#eeeeee', width=scale)
+        for i, day in enumerate(week):
+            if day == 0:
+                continue
+            center_x = margin + cell_width * (i + 0.5)
+            lines = [str(day)]
+            day_titles = titles.loc[occupancy[day]].tolist()
+            if len(day_titles) > max_lines:
+                # 넘치는 일정은 개수로 표시
+                day_titles = day_titles[:max(max_lines - 1, 0)] + [f'외 {len(day_titles) - max_lines + 1}건']
+            lines += [_fit_text(draw, f'• {title}', cell_font, cell_width - 8 * scale) for title in day_titles]
+            for n, text in enumerate(lines):
+                draw.text((center_x, y + 4 * scale + n * line_height), text,
+                          font=cell_font, fill=weekday_colors[i], anchor='ma')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=False)
+    return buffer.getvalue()
+
+@traced
+def render_kaleido_png(events_df, year, month, scale=IMAGE_SCALE):
+    fig = create_calendar_image(events_df, year, month)
+    return fig.to_image(format="png", width=IMAGE_WIDTH, height=IMAGE_HEIGHT, scale=scale)
+
+PNG_RENDERERS = {
+    'kaleido': render_kaleido_png,
+    'raster': render_raster_png,
+}
+
+def _render_month(task):
+    # 프로세스 풀 작업 단위: (일정 DataFrame, 년, 월, 렌더러) → PNG 바이트
+    events_df, year, month, renderer = task
+    return PNG_RENDERERS[renderer](events_df, year, month)
+
+# 렌더링한 PNG 캐시 (db.QueryCache와 같은 LRU, 데이터 버전이 바뀌면 미스)
+_image_cache = db.QueryCache(maxsize=IMAGE_CACHE_SIZE)
+
+def get_image_cache_stats():
+    return _image_cache.stats()
+
+def render_month_png(year, month, renderer='kaleido'):
+    # 월간 캘린더 PNG (같은 데이터 버전이면 캐시된 이미지 반환)
+    version = db.get_pool().data_version()
+    key = (db.get_pool().path, year, month, renderer)
+    hit, png = _image_cache.get(key, version)
+    if not hit:
+        png = _render_month((get_month_events(year, month), year, month, renderer))
+        _image_cache.put(key, version, png)
+    return png
+
+@traced
+def render_year_zip(year, renderer='kaleido'):
+    # 1~12월 PNG를 ZIP으로 묶어 반환
+    # 캐시에 없는 달만 프로세스 풀에서 병렬로 렌더링한 뒤 캐시에 채워 넣음
+    version = db.get_pool().data_version()
+    path = db.get_pool().path
+    images = {}
+    missing = []
+    for month in range(1, 13):
+        hit, png = _image_cache.get((path, year, month, renderer), version)
+        if hit:
+            images[month] = png
+        else:
+            missing.append(month)
+
+    if missing:
+        tasks = [(get_month_events(year, month), year, month, renderer) for month in missing]
+        workers = min(YEAR_EXPORT_WORKERS, len(tasks))
+        if workers > 1:
+            # Streamlit 서버는 여러 스레드를 쓰므로 fork 대신 spawn으로 새 프로세스 시작
+            with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn')) as pool:
+                rendered = list(pool.map(_render_month, tasks))
+        else:
+            rendered = [_render_month(task) for task in tasks]
+        for month, png in zip(missing, rendered):
+            images[month] = png
+            _image_cache.put((path, year, month, renderer), version, png)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zf:
+        for month in range(1, 13):
+            zf.writestr(f"calendar_{year}_{month:02d}.png", images[month])
+    return buffer.getvalue()
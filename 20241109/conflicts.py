@@ -0,0 +1,89 @@
+# conflicts.py
+# 일정 충돌(기간 겹침) 및 일별 부하 분석
+# 시작일 정렬 + 이진 탐색으로 처리하므로 일정 수 n에 대해 O(n log n) (+ 나열하는 충돌 쌍 수)
+import numpy as np
+import pandas as pd
+from occupancy import parse_event_dates
+from timing import traced
+
+MAX_CONFLICT_PAIRS = 1000   # 목록으로 돌려줄 충돌 쌍 최대 개수 (전체 개수는 따로 셈)
+TOP_PEAK_DAYS = 10
+
+def overlap_counts(start, end):
+    # 일정마다 기간이 겹치는 다른 일정 수
+    # 겹침 = (다른 일정 시작일 <= 내 종료일) - (다른 일정 종료일 < 내 시작일) - 자기 자신
+    starts = np.sort(start)
+    ends = np.sort(end)
+    return (
+        np.searchsorted(starts, end, side='right')
+        - np.searchsorted(ends, start, side='left')
+        - 1
+    )
+
+def overlapping_pairs(start, end, max_pairs=MAX_CONFLICT_PAIRS):
+    # 겹치는 일정 쌍 (i, j: 입력 배열 위치)과 전체 쌍 개수
+    # 시작일순으로 훑으면서 각 일정 뒤에 오는 일정 중 내 종료일 전에 시작하는 것들이 충돌 상대
+    order = np.argsort(start, kind='stable')
+    starts = start[order]
+    ends = end[order]
+    positions = np.arange(len(order))
+    # 정렬 위치 p의 일정과 겹치는 뒤쪽 일정: p+1 ~ last[p]-1
+    last = np.searchsorted(starts, ends, side='right')
+    counts = last - positions - 1
+    total = int(counts.sum())
+
+    # max_pairs개까지만 펼침 (앞에서부터 누적 개수로 자름)
+    taken = np.minimum(counts, np.maximum(max_pairs - (np.cumsum(counts) - counts), 0))
+    first = np.repeat(positions, taken)
+    offsets = np.arange(int(taken.sum())) - np.repeat(np.cumsum(taken) - taken, taken)
+    second = first + 1 + offsets
+    return order[first], order[second], total
+
+def daily_load(start, end):
+    # 날짜별로 진행 중인 일정 수 (차분 배열 누적합), 종료일 포함
+    # 종료일이 시작일보다 빠른 일정은 진행 중인 날이 없으므로 뺌
+    valid = start <= end
+    start, end = start[valid], end[valid]
+    if len(start) == 0:
+        return pd.Series(dtype=np.int64, index=pd.DatetimeIndex([]), name='count')
+    first = start.min()
+    days = np.arange(first, end.max() + np.timedelta64(1, 'D'))
+    delta = np.zeros(len(days) + 1, dtype=np.int64)
+    np.add.at(delta, (start - first).astype(np.int64), 1)
+    np.add.at(delta, (end - first).astype(np.int64) + 1, -1)
+    return pd.Series(np.cumsum(delta[:-1]), index=pd.DatetimeIndex(days), name='count')
+
+@traced
+def analyze_schedule(events_df, max_pairs=MAX_CONFLICT_PAIRS):
+    # 반환: dict
+    #   conflict_counts: 일정별 겹치는 일정 수 (events_df 인덱스)
+    #   pairs: 충돌 쌍 목록 (최대 max_pairs개, 겹치는 기간 포함), total_pairs: 전체 충돌 쌍 수
+    #   load: 일별 진행 중 일정 수, peak_days: 가장 붐비는 날짜들
+    #   skipped: 종료일이 시작일보다 빨라 분석에서 뺀 일정 수 (충돌 수는 0으로 표시)
+    start, end = parse_event_dates(events_df)
+    # 예전 CSV 가져오기나 시작일만 바꾼 일괄 수정으로 기간이 뒤집힌 일정이 있을 수 있음
+    valid = start <= end
+    positions = np.flatnonzero(valid)
+    start, end = start[valid], end[valid]
+    first, second, total = overlapping_pairs(start, end, max_pairs)
+    ids = (events_df['id'] if 'id' in events_df else events_df.index).to_numpy()
+    titles = events_df['title'].to_numpy()
+    pairs = pd.DataFrame({
+        'first_id': ids[positions[first]],
+        'first_title': titles[positions[first]],
+        'second_id': ids[positions[second]],
+        'second_title': titles[positions[second]],
+        'overlap_start': np.datetime_as_string(np.maximum(start[first], start[second]), unit='D'),
+        'overlap_end': np.datetime_as_string(np.minimum(end[first], end[second]), unit='D'),
+    })
+    conflict_counts = np.zeros(len(events_df), dtype=np.int64)
+    conflict_counts[positions] = overlap_counts(start, end)
+    load = daily_load(start, end)
+    return {
+        'conflict_counts': pd.Series(conflict_counts, index=events_df.index, name='conflicts'),
+        'pairs': pairs,
+        'total_pairs': total,
+        'load': load,
+        'peak_days': load.nlargest(TOP_PEAK_DAYS),
+        'skipped': len(events_df) - len(positions),
+    }
@@ -1,94 +1,1208 @@
 # db.py
 import sqlite3
 import os
+import queue
+import threading
+import functools
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import re
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from itertools import count, islice
+from datetime import date
 import pandas as pd
+from timing import TimedConnection, traced
 
-def delete_all_events():
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('DELETE FROM events')
-    conn.commit()
-    conn.close()
+DB_PATH = 'calendar.db'
 
-def create_database():
-    # 데이터베이스 파일이 있는지 확인
-    if not os.path.exists('calendar.db'):
-        # 데이터베이스 연결
-        conn = sqlite3.connect('calendar.db')
-        c = conn.cursor()
-        
-        # events 테이블 생성
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS events
-            (id INTEGER PRIMARY KEY AUTOINCREMENT,
-             title TEXT NOT NULL,
-             start_date DATE NOT NULL,
-             end_date DATE NOT NULL,
-             color TEXT,
-             description TEXT)
+logger = logging.getLogger(__name__)
+
+# 프로젝트마다 데이터베이스 파일을 따로 둠
+# 기본 프로젝트는 DB_PATH 파일, 나머지는 DB_PATH 옆 PROJECTS_DIR 폴더의 '<이름>.db'
+# 연결 풀/쓰기 스레드/조회 캐시/기간 인덱스/통계 테이블이 모두 파일별이라
+# 조회와 전체 삭제 비용은 다른 프로젝트의 일정 수와 관계없이 해당 프로젝트 크기에만 비례
+DEFAULT_PROJECT = '기본'
+PROJECTS_DIR = 'projects'
+PROJECT_NAME_PATTERN = re.compile(r'[\w\- ]{1,40}')    # 파일 이름으로 쓰므로 경로 구분자/마침표 불가
+
+# 연결 풀 설정
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+
+# 조회 결과 캐시에 보관할 최대 항목 수
+CACHE_SIZE = 64
+
+# 대량 등록 시 커밋 단위 (행 수)
+BULK_BATCH_SIZE = 5000
+
+# 삭제 후 파일 크기를 되돌리는 증분 VACUUM 설정
+AUTO_VACUUM_INCREMENTAL = 2     # PRAGMA auto_vacuum 값 (0: NONE, 1: FULL, 2: INCREMENTAL)
+VACUUM_MIN_FREE_PAGES = 256     # 빈 페이지가 이보다 적으면 정리하지 않음
+VACUUM_STEP_PAGES = 2048        # 한 번에 정리하는 페이지 수 (나머지는 다른 쓰기 사이에 이어서 처리)
+
+# 일괄 변경 시 행마다 쓰기 알림(interval_index 등)을 보내는 최대 행 수
+# 이보다 많으면 'reset' 알림 한 번으로 다시 만들게 함
+NOTIFY_ROW_LIMIT = 1000
+
+# 쓰기 전용 스레드가 한 트랜잭션(그룹 커밋)으로 묶는 최대 작업 수
+WRITER_BATCH_SIZE = 256
+
+# 연결마다 적용할 PRAGMA 설정
+PRAGMAS = {
+    'busy_timeout': BUSY_TIMEOUT_MS,
+    'synchronous': 'NORMAL',    # WAL 모드에서는 NORMAL로도 안전
+    'cache_size': -20000,       # 음수는 KB 단위 (약 20MB)
+    'mmap_size': 268435456,     # 256MB
+    'temp_store': 'MEMORY',
+}
+
+# 기간 조회(겹침 검사)와 정렬/키셋 페이지네이션에 사용하는 인덱스
+# (단일 컬럼 인덱스는 뒤에 rowid가 붙으므로 (컬럼, id) 순서로 정렬되어 있음)
+INDEXES = {
+    'idx_events_start_end': 'events(start_date, end_date)',
+    'idx_events_start': 'events(start_date)',
+    'idx_events_end': 'events(end_date)',
+    'idx_events_title': 'events(title)',
+}
+
+# 목록 조회 시 정렬 가능한 컬럼과 기본 페이지 크기
+SORT_COLUMNS = ('start_date', 'end_date', 'title')
+PAGE_SIZE = 50
+
+# 내보내기 컬럼과 한 번에 읽어 오는 행 수
+EXPORT_COLUMNS = ('title', 'start_date', 'end_date', 'color', 'description')
+EXPORT_CHUNK_SIZE = 5000
+
+# 제목/설명 전문 검색용 FTS5 테이블 (trigram: 한글 부분 일치 지원)
+# events를 외부 콘텐츠로 사용하고 트리거로 동기화
+FTS_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description,
+        content='events', content_rowid='id',
+        tokenize='trigram'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO events_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    ''',
+]
+
+# 날짜를 정수 일수(1970-01-01 기준)로도 보관하는 가상 생성 컬럼
+# TEXT 컬럼(start_date/end_date)이 원본이므로 CSV/화면 코드는 그대로 'YYYY-MM-DD'를 사용
+DAY_COLUMNS = {
+    'start_day': 'start_date',
+    'end_day': 'end_date',
+}
+EPOCH = date(1970, 1, 1)
+
+# True: 기간 조건을 정수 일수 컬럼으로 비교 (False면 TEXT 날짜 비교)
+INTEGER_DATES = True
+
+# trigram 토크나이저가 색인하는 최소 글자 수 (이보다 짧으면 LIKE 검색)
+FTS_MIN_KEYWORD = 3
+
+# 같은 일정으로 보는 컬럼 (가져오기 시 중복 판정 기준)
+IDENTITY_COLUMNS = ('title', 'start_date', 'end_date')
+
+# 통계용 요약 테이블 (시작 월 × 색상별 일정 수와 기간 합계)
+# 트리거로 events 변경을 바로 반영하므로 현황 화면은 이 테이블의 몇 줄만 읽음
+# 예전 CSV 가져오기로 들어온 'YYYY/MM/DD' 같은 날짜는 일수가 NULL이므로 기간 0일로 셈
+STATS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS event_stats
+    (month TEXT NOT NULL,
+     color TEXT NOT NULL,
+     event_count INTEGER NOT NULL,
+     total_days INTEGER NOT NULL,
+     PRIMARY KEY (month, color)) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS event_stats_ai AFTER INSERT ON events BEGIN
+        INSERT INTO event_stats (month, color, event_count, total_days)
+        VALUES (substr(new.start_date, 1, 7), coalesce(new.color, ''), 1, coalesce(new.end_day - new.start_day + 1, 0))
+        ON CONFLICT (month, color) DO UPDATE
+        SET event_count = event_count + 1, total_days = total_days + excluded.total_days;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS event_stats_ad AFTER DELETE ON events BEGIN
+        UPDATE event_stats
+        SET event_count = event_count - 1, total_days = total_days - coalesce(old.end_day - old.start_day + 1, 0)
+        WHERE month = substr(old.start_date, 1, 7) AND color = coalesce(old.color, '');
+        DELETE FROM event_stats
+        WHERE month = substr(old.start_date, 1, 7) AND color = coalesce(old.color, '') AND event_count <= 0;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS event_stats_au AFTER UPDATE OF start_date, end_date, color ON events BEGIN
+        UPDATE event_stats
+        SET event_count = event_count - 1, total_days = total_days - coalesce(old.end_day - old.start_day + 1, 0)
+        WHERE month = substr(old.start_date, 1, 7) AND color = coalesce(old.color, '');
+        DELETE FROM event_stats
+        WHERE month = substr(old.start_date, 1, 7) AND color = coalesce(old.color, '') AND event_count <= 0;
+        INSERT INTO event_stats (month, color, event_count, total_days)
+        VALUES (substr(new.start_date, 1, 7), coalesce(new.color, ''), 1, coalesce(new.end_day - new.start_day + 1, 0))
+        ON CONFLICT (month, color) DO UPDATE
+        SET event_count = event_count + 1, total_days = total_days + excluded.total_days;
+    END
+    ''',
+]
+
+# events에 걸린 트리거 (전체 삭제 시 잠시 떼어 내고 truncate 최적화를 사용)
+EVENT_TRIGGERS = FTS_SCHEMA[1:] + STATS_SCHEMA[1:]
+
+EVENTS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS events
+    (id INTEGER PRIMARY KEY AUTOINCREMENT,
+     title TEXT NOT NULL,
+     start_date DATE NOT NULL,
+     end_date DATE NOT NULL,
+     color TEXT,
+     description TEXT)
+'''
+
+def _create_events_table(conn):
+    conn.execute(EVENTS_SCHEMA)
+
+def _create_indexes(conn):
+    for name, target in INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+
+def _create_fts(conn):
+    # 기존 일정으로 색인을 다시 만들어 둠
+    for statement in FTS_SCHEMA:
+        conn.execute(statement)
+    conn.execute("INSERT INTO events_fts(events_fts) VALUES ('rebuild')")
+
+def _add_day_columns(conn):
+    # julianday()로 계산되는 VIRTUAL 컬럼이라 기존 행도 바로 값이 채워지고, 인덱스에는 정수로 저장됨
+    for column, source in DAY_COLUMNS.items():
+        conn.execute(f'''
+            ALTER TABLE events ADD COLUMN {column} INTEGER
+            GENERATED ALWAYS AS (CAST(julianday({source}) - 2440587.5 AS INTEGER)) VIRTUAL
         ''')
-        
-        # 샘플 데이터 추가 (선택사항)
-        c.execute('''
-            INSERT INTO events (title, start_date, end_date, color, description)
-            VALUES (?, ?, ?, ?, ?)
-        ''', ('샘플 일정', '2024-11-10', '2024-11-15', '#FF6B6B', '샘플 일정입니다.'))
-        
-        conn.commit()
-        conn.close()
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_events_days ON events(start_day, end_day)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_events_end_day ON events(end_day)')
+
+def _create_identity_index(conn):
+    # 가져오기 중복 판정 기준 (제목, 시작일, 종료일)
+    # 이미 중복 행이 있을 수 있고 일반 등록은 중복을 허용하므로 UNIQUE가 아닌 일반 인덱스
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_events_identity ON events({", ".join(IDENTITY_COLUMNS)})')
+
+def _create_stats(conn):
+    # 기존 일정으로 요약 테이블을 채운 뒤 트리거 생성
+    conn.execute(STATS_SCHEMA[0])
+    conn.execute('''
+        INSERT INTO event_stats (month, color, event_count, total_days)
+        SELECT substr(start_date, 1, 7), coalesce(color, ''), COUNT(*), SUM(coalesce(end_day - start_day + 1, 0))
+        FROM events
+        GROUP BY 1, 2
+    ''')
+    for statement in STATS_SCHEMA[1:]:
+        conn.execute(statement)
+
+# 스키마 마이그레이션 목록 (순서대로 한 번씩 적용, 적용된 개수는 PRAGMA user_version에 기록)
+# 스키마를 바꿀 때는 기존 항목을 고치지 말고 항상 끝에 추가
+MIGRATIONS = [
+    _create_events_table,   # 1: events 테이블
+    _create_indexes,        # 2: 기간 조회/정렬 인덱스
+    _create_fts,            # 3: 전문 검색 테이블과 동기화 트리거
+    _add_day_columns,       # 4: 정수 일수 컬럼과 인덱스
+    _create_stats,          # 5: 통계 요약 테이블과 동기화 트리거
+    _create_identity_index, # 6: 가져오기 중복 판정용 인덱스
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(conn):
+    # 아직 적용되지 않은 마이그레이션을 하나씩 별도 트랜잭션으로 적용하고 최종 버전을 반환
+    # BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 여러 프로세스가 동시에 시작해도 한 번씩만 적용됨
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                conn.rollback()
+                return version
+            MIGRATIONS[version](conn)
+            conn.execute(f'PRAGMA user_version = {version + 1}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+class ConnectionPool:
+    # 프로세스 전체에서 공유하는 SQLite 연결 풀
+    # Streamlit은 rerun마다 스크립트 스레드가 바뀌므로 스레드 로컬 대신 풀을 사용한다
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._initialized = False
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._writer = None
+
+    def writer(self):
+        # 이 DB의 쓰기 전용 스레드 (처음 쓸 때 시작, 연결을 열지 못해 끝난 스레드는 새로 시작)
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = Writer(self)
+            return self._writer
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            factory=TimedConnection    # 계측이 켜져 있으면 SQL 문마다 실행 시간 기록
+        )
+        for name, value in PRAGMAS.items():
+            conn.execute(f'PRAGMA {name}={value}')
+        # WAL 저널 모드와 스키마는 파일에 기록되므로 프로세스에서 처음 연결할 때 한 번만 처리
+        with self._lock:
+            if not self._initialized:
+                # auto_vacuum은 테이블이 생기기 전에 정해야 하고, 기존 파일은 VACUUM 한 번으로 전환됨
+                if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != AUTO_VACUUM_INCREMENTAL:
+                    conn.execute(f'PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}')
+                    conn.execute('VACUUM')
+                conn.execute('PRAGMA journal_mode=WAL')
+                migrate(conn)
+                conn.execute('PRAGMA optimize')
+                self._initialized = True
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            # 끝나지 않은 트랜잭션이 남아 있으면 되돌린 뒤 반납
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def data_version(self):
+        # 다른 연결(같은 프로세스의 풀 연결 포함)이 커밋할 때마다 바뀌는 값
+        # 변경 감지 전용 연결 하나로 읽어서 프로세스 전체의 데이터 버전으로 사용
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(self.path, check_same_thread=False)
+            return self._watcher.execute('PRAGMA data_version').fetchone()[0]
+
+    def close_all(self):
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+        with self._lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+class Writer:
+    # 모든 쓰기를 한 스레드에서 전용 연결로 처리해 프로세스 안에서는 "database is locked"가 나지 않게 함
+    # 대기 중인 작업을 최대 WRITER_BATCH_SIZE개까지 모아 한 트랜잭션으로 커밋(그룹 커밋)
+    # submit()은 Future를 반환하며, 커밋이 끝난 뒤에 결과가 채워짐
+    _STOP = object()
+
+    def __init__(self, pool, batch_size=WRITER_BATCH_SIZE):
+        self.pool = pool
+        self.batch_size = batch_size
+        self._jobs = queue.Queue()
+        self._error = None      # 연결을 열지 못했을 때의 예외 (이후 submit은 바로 이 예외로 실패)
+        self._submit_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+        self.commits = 0
+        self.jobs_done = 0
+        # 지금 커밋 중인 트랜잭션 정보 (시작 직전의 데이터 버전, 커밋 번호), on_commit에서 읽음
+        self.commit_info = None
+
+    def submit(self, job, *args, on_commit=None):
+        # job(conn, *args)를 쓰기 스레드에서 실행
+        # on_commit(result)은 커밋 직후 Future가 완료되기 전에 쓰기 스레드에서 호출됨
+        future = Future()
+        with self._submit_lock:
+            if self._error is not None:
+                future.set_exception(self._error)
+            else:
+                self._jobs.put((job, args, on_commit, future))
+        return future
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def close(self):
+        self._jobs.put(self._STOP)
+        self._thread.join()
+
+    def _take_batch(self):
+        # 첫 작업은 올 때까지 기다리고, 이미 쌓여 있는 작업은 기다리지 않고 함께 가져옴
+        batch = [self._jobs.get()]
+        while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+            try:
+                batch.append(self._jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _fail_pending(self, error):
+        # 쓰기 스레드를 끝내기 전에 대기 중인 작업을 모두 같은 예외로 실패시킴 (호출한 쪽이 영원히 기다리지 않도록)
+        with self._submit_lock:
+            self._error = error
+            while True:
+                try:
+                    item = self._jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not self._STOP and item[3].set_running_or_notify_cancel():
+                    item[3].set_exception(error)
+
+    def _run(self):
+        try:
+            conn = self.pool._connect()
+        except Exception as e:
+            # 다른 프로세스가 마이그레이션/VACUUM으로 쓰기 잠금을 오래 잡고 있는 경우 등
+            self._fail_pending(e)
+            return
+        try:
+            while True:
+                batch = self._take_batch()
+                stop = batch[-1] is self._STOP
+                if stop:
+                    batch.pop()
+                # 호출한 쪽에서 취소한 작업은 건너뜀
+                batch = [item for item in batch if item[3].set_running_or_notify_cancel()]
+                if batch:
+                    self._commit(conn, batch)
+                if stop:
+                    break
+        finally:
+            conn.close()
+
+    def _commit(self, conn, batch):
+        # 작업 전체를 한 트랜잭션으로 실행하고 커밋
+        # 하나라도 실패하면 전체를 되돌린 뒤 작업마다 따로 다시 실행해 실패한 작업만 예외를 받게 함
+        # (작업별 SAVEPOINT는 FTS5 색인 갱신을 크게 느리게 해서 사용하지 않음)
+        results = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            # 쓰기 잠금을 잡은 뒤라 이 값과 커밋 직전 사이에 다른 연결의 커밋은 끼어들 수 없음
+            self.commit_info = (self.pool.data_version(), self.commits + 1)
+            for job, args, on_commit, future in batch:
+                results.append(job(conn, *args))
+            conn.commit()
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            if len(batch) > 1:
+                for item in batch:
+                    self._commit(conn, [item])
+            else:
+                batch[0][3].set_exception(e)
+            return
+        self.commits += 1
+        self.jobs_done += len(batch)
+        for (job, args, on_commit, future), result in zip(batch, results):
+            if on_commit is not None:
+                try:
+                    on_commit(result)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(result)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# 현재 스레드의 DB 호출이 사용할 프로젝트 (Streamlit에서는 페이지 스크립트마다 use_project로 지정)
+_current_project = ContextVar('current_project', default=DEFAULT_PROJECT)
+
+def _projects_dir():
+    return os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), PROJECTS_DIR)
+
+def project_path(name):
+    if name == DEFAULT_PROJECT:
+        return DB_PATH
+    return os.path.join(_projects_dir(), f'{name}.db')
+
+def list_projects():
+    # 기본 프로젝트가 항상 첫 번째
+    directory = _projects_dir()
+    names = sorted(
+        file_name[:-3] for file_name in os.listdir(directory) if file_name.endswith('.db')
+    ) if os.path.isdir(directory) else []
+    return [DEFAULT_PROJECT] + [name for name in names if name != DEFAULT_PROJECT]
+
+def create_project(name):
+    # 새 프로젝트 파일을 만들고 스키마까지 준비한 뒤 이름을 반환
+    name = name.strip()
+    if not PROJECT_NAME_PATTERN.fullmatch(name):
+        raise ValueError("프로젝트 이름은 40자 이내의 한글/영문/숫자/공백/-/_만 사용할 수 있습니다.")
+    if name in list_projects():
+        raise ValueError(f"이미 있는 프로젝트입니다: {name}")
+    os.makedirs(_projects_dir(), exist_ok=True)
+    with get_pool(project_path(name)).connection():
+        pass
+    return name
+
+def current_project():
+    return _current_project.get()
+
+def use_project(name):
+    # 이후 이 스레드(컨텍스트)의 DB 호출을 name 프로젝트로 보냄
+    if name not in list_projects():
+        raise ValueError(f"없는 프로젝트입니다: {name}")
+    _current_project.set(name)
+
+@contextmanager
+def project_scope(name):
+    # 블록 안에서만 name 프로젝트 사용 (위젯 콜백, 백그라운드 작업 등)
+    token = _current_project.set(name)
+    try:
+        yield
+    finally:
+        _current_project.reset(token)
+
+def get_pool(path=None):
+    path = os.path.abspath(path or project_path(current_project()))
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path)
+    return pool
+
+def close_all_connections():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+    _query_cache.clear()
+
+class QueryCache:
+    # 세션 간에 공유하는 조회 결과 LRU 캐시
+    # 항목마다 저장 당시의 데이터 버전을 기록하고, 버전이 다르면 미스로 처리
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+_query_cache = QueryCache()
+
+def get_cache_stats():
+    return _query_cache.stats()
+
+def cached_query(func):
+    # 조회 함수 결과를 (DB 파일, 함수, 인자) 기준으로 캐시
+    # 데이터가 바뀌면 PRAGMA data_version이 달라져 자동으로 다시 조회됨
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        pool = get_pool()
+        key = (pool.path, func.__name__, args, tuple(sorted(kwargs.items())))
+        version = pool.data_version()
+        hit, value = _query_cache.get(key, version)
+        if not hit:
+            value = func(*args, **kwargs)
+            _query_cache.put(key, version, value)
+        # 캐시된 DataFrame을 호출한 쪽에서 수정하지 못하도록 복사본 반환
+        return _copy_result(value)
+    return wrapper
+
+# 다음에 필요할 조회를 미리 실행해 캐시를 채우는 백그라운드 스레드 (예: 캘린더의 이전/다음 달)
+PREFETCH_WORKERS = 1
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+def prefetch(func, *args, **kwargs):
+    # cached_query 함수를 백그라운드에서 호출 (결과는 캐시에만 남김), Future 반환
+    # 호출한 쪽의 현재 프로젝트가 그대로 적용되도록 컨텍스트를 복사해서 실행
+    return _prefetch_executor.submit(copy_context().run, func, *args, **kwargs)
+
+def _copy_result(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy_result(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    return value
+
+@contextmanager
+def connect():
+    # 읽기 전용 작업용 연결
+    with get_pool().connection() as conn:
+        yield conn
+
+# 일정 한 건이 바뀔 때 알림을 받을 함수 목록
+# (interval_index처럼 메모리에 둔 구조를 전체 재구성 없이 변경분만 반영할 때 사용)
+_write_listeners = []
+
+def add_write_listener(listener):
+    # listener(path, action, event_id, start_date, end_date, commit_info)
+    # action: 'add' / 'update' / 'delete', 'reset'은 행 단위로 알리지 않는 변경(일괄 등록/전체 삭제 등)
+    # commit_info: (트랜잭션 시작 직전의 데이터 버전, 커밋 번호) → 그 사이 알림 없는 변경이 있었는지 판단용
+    # 쓰기 스레드에서 커밋 직후에 호출됨
+    _write_listeners.append(listener)
+
+def _notify_write(path, action, event_id, start_date=None, end_date=None):
+    commit_info = get_pool(path).writer().commit_info
+    for listener in _write_listeners:
+        listener(path, action, event_id, start_date, end_date, commit_info)
+
+def _notify_reset(path):
+    _notify_write(path, 'reset', None)
+
+def submit_write(job, *args, on_commit=None):
+    # 쓰기 작업 job(conn, *args)을 현재 DB의 쓰기 스레드에 넘기고 Future를 반환
+    # 아래 쓰기 함수들은 wait=False로 호출하면 결과 대신 이 Future를 돌려줌
+    return get_pool().writer().submit(job, *args, on_commit=on_commit)
+
+def _write(job, *args, on_commit=None, wait=True):
+    future = submit_write(job, *args, on_commit=on_commit)
+    return future.result() if wait else future
+
+def _delete_all(conn):
+    # 트리거가 있으면 행마다 FTS/통계를 갱신하므로, 트리거를 뗀 채 지워서
+    # SQLite의 truncate 최적화(테이블 페이지를 통째로 비움)를 사용하고 색인/통계는 한 번에 비움
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'events'").fetchall():
+        conn.execute(f'DROP TRIGGER {name}')
+    conn.execute('DELETE FROM events')
+    conn.execute("INSERT INTO events_fts(events_fts) VALUES ('delete-all')")
+    conn.execute('DELETE FROM event_stats')
+    for statement in EVENT_TRIGGERS:
+        conn.execute(statement)
+
+@traced
+def delete_all_events(wait=True):
+    path = get_pool().path
+    result = _write(_delete_all, on_commit=lambda _: _notify_reset(path), wait=wait)
+    schedule_vacuum()
+    return result
+
+def _incremental_vacuum(conn, pages):
+    # 빈 페이지를 최대 pages개 파일 끝에서 잘라내고 남은 빈 페이지 수를 반환
+    free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    if free >= VACUUM_MIN_FREE_PAGES:
+        conn.execute(f'PRAGMA incremental_vacuum({pages})').fetchall()
+        free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    return free
+
+def schedule_vacuum(pages=VACUUM_STEP_PAGES):
+    # 대량 삭제 뒤 파일 크기를 줄이는 작업을 쓰기 스레드에 예약
+    # 한 번에 pages개씩 정리하고, 남아 있으면 다시 예약해서 다른 쓰기가 오래 기다리지 않게 함
+    def reschedule(free):
+        if free >= VACUUM_MIN_FREE_PAGES:
+            writer.submit(_incremental_vacuum, pages, on_commit=reschedule)
+
+    writer = get_pool().writer()
+    return writer.submit(_incremental_vacuum, pages, on_commit=reschedule)
+
+def create_database():
+    # 데이터베이스 파일이 없으면 새로 만들고 샘플 데이터 추가
+    if not os.path.exists(DB_PATH):
+        add_event('샘플 일정', '2024-11-10', '2024-11-15', '#FF6B6B', '샘플 일정입니다.')
         print("데이터베이스가 성공적으로 생성되었습니다.")
 
 def init_db():
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    
-    # events 테이블이 없으면 생성
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS events
-        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-         title TEXT NOT NULL,
-         start_date DATE NOT NULL,
-         end_date DATE NOT NULL,
-         color TEXT,
-         description TEXT)
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-def add_event(title, start_date, end_date, color, description=""):
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('''
+    # 스키마 준비 (연결 풀이 처음 연결할 때 마이그레이션까지 끝내므로 여러 번 호출해도 비용 없음)
+    with connect():
+        pass
+
+def _to_date_str(value):
+    # date/datetime/Timestamp/문자열을 'YYYY-MM-DD' 문자열로 통일
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    return pd.to_datetime(value).strftime('%Y-%m-%d')
+
+def _to_day_number(value):
+    # 1970-01-01부터의 일수 (start_day/end_day 컬럼과 같은 기준)
+    return (date.fromisoformat(_to_date_str(value)) - EPOCH).days
+
+def _date_columns():
+    # INTEGER_DATES이면 문자열 대신 정수 일수 컬럼으로 비교
+    # 반환: (시작 컬럼, 종료 컬럼, 파라미터 변환 함수)
+    if INTEGER_DATES:
+        return 'start_day', 'end_day', _to_day_number
+    return 'start_date', 'end_date', _to_date_str
+
+def _date_clauses(start=None, end=None, contained=True, alias=''):
+    # 기간 조건 (WHERE 절 조각 목록, 파라미터 목록), start/end는 생략 가능
+    # contained=True: 기간 안에 완전히 포함, False: 기간과 하루라도 겹침
+    start_col, end_col, convert = _date_columns()
+    where, params = [], []
+    if start is not None:
+        where.append(f'{alias}{start_col if contained else end_col} >= ?')
+        params.append(convert(start))
+    if end is not None:
+        where.append(f'{alias}{end_col if contained else start_col} <= ?')
+        params.append(convert(end))
+    return where, params
+
+def _insert_event(conn, title, start_date, end_date, color, description):
+    return conn.execute('''
+        INSERT INTO events (title, start_date, end_date, color, description)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (title, start_date, end_date, color, description)).lastrowid
+
+@traced
+def add_event(title, start_date, end_date, color, description="", wait=True):
+    # 등록된 일정 id를 반환 (wait=False면 Future)
+    path = get_pool().path
+    return _write(
+        _insert_event, title, start_date, end_date, color, description,
+        on_commit=lambda event_id: _notify_write(path, 'add', event_id, start_date, end_date),
+        wait=wait
+    )
+
+def _insert_batch(conn, batch):
+    conn.executemany('''
         INSERT INTO events (title, start_date, end_date, color, description)
         VALUES (?, ?, ?, ?, ?)
-    ''', (title, start_date, end_date, color, description))
-    conn.commit()
-    conn.close()
+    ''', batch)
+    return len(batch)
 
+@traced
+def add_events_bulk(events, batch_size=BULK_BATCH_SIZE):
+    # events: (title, start_date, end_date, color, description) 튜플의 iterable
+    # batch_size 행마다 executemany 후 한 번씩 커밋하고, 등록된 행 수를 반환
+    # 배치마다 쓰기 스레드에 넘기되, 다음 배치를 읽는 동안 직전 배치가 커밋되도록 한 개씩 앞서 보냄
+    path = get_pool().path
+    rows = iter(events)
+    inserted = 0
+    previous = None
+    while True:
+        batch = list(islice(rows, batch_size))
+        if previous is not None:
+            inserted += previous.result()
+        if not batch:
+            break
+        previous = submit_write(_insert_batch, batch, on_commit=lambda _: _notify_reset(path))
+    return inserted
+
+# 중복 갱신 가져오기용 임시 테이블 (쓰기 스레드 연결에만 생기므로 가져오기마다 이름을 달리함)
+_staging_ids = count(1)
+
+def _stage_batch(conn, table, batch):
+    # 파일 안에서 같은 일정이 여러 번 나오면 마지막 행의 색상/설명을 사용
+    conn.execute(f'''
+        CREATE TEMP TABLE IF NOT EXISTS {table}
+        (title TEXT NOT NULL, start_date DATE NOT NULL, end_date DATE NOT NULL,
+         color TEXT, description TEXT, status TEXT,
+         UNIQUE (title, start_date, end_date))
+    ''')
+    conn.executemany(f'''
+        INSERT INTO temp.{table} (title, start_date, end_date, color, description)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (title, start_date, end_date) DO UPDATE
+        SET color = excluded.color, description = excluded.description
+    ''', batch)
+    return len(batch)
+
+def _merge_staged(conn, table):
+    # 임시 테이블의 행을 기존 일정과 한 번에 비교해서 분류한 뒤 갱신/추가 (쓰기 스레드의 한 트랜잭션)
+    # 같은 일정이 있고 색상/설명도 같으면 skip, 색상/설명만 다르면 update, 없으면 insert
+    # 반환: (추가 건수, 갱신 건수)
+    match = ' AND '.join(f'e.{column} = s.{column}' for column in IDENTITY_COLUMNS)
+    conn.execute(f'''
+        UPDATE temp.{table} AS s SET status = CASE
+            WHEN EXISTS (SELECT 1 FROM events e WHERE {match}
+                         AND e.color IS s.color AND e.description IS s.description) THEN 'skip'
+            WHEN EXISTS (SELECT 1 FROM events e WHERE {match}) THEN 'update'
+            ELSE 'insert'
+        END
+    ''')
+    conn.execute(f'''
+        UPDATE events AS e SET color = s.color, description = s.description
+        FROM temp.{table} AS s
+        WHERE s.status = 'update' AND {match}
+    ''')
+    # 기존에 같은 일정이 여러 건이면 모두 갱신되지만, 건수는 가져온 행 기준으로 셈
+    updated = conn.execute(f"SELECT COUNT(*) FROM temp.{table} WHERE status = 'update'").fetchone()[0]
+    inserted = conn.execute(f'''
+        INSERT INTO events (title, start_date, end_date, color, description)
+        SELECT title, start_date, end_date, color, description
+        FROM temp.{table}
+        WHERE status = 'insert'
+        ORDER BY rowid
+    ''').rowcount
+    conn.execute(f'DROP TABLE temp.{table}')
+    return inserted, updated
+
+def _drop_staged(conn, table):
+    conn.execute(f'DROP TABLE IF EXISTS temp.{table}')
+
+@traced
+def upsert_events_bulk(events, batch_size=BULK_BATCH_SIZE):
+    # add_events_bulk와 같은 입력을 받되, (제목, 시작일, 종료일)이 같은 일정이 이미 있으면 새로 만들지 않음
+    # 색상/설명이 다르면 갱신하고 같으면 건너뜀, 파일 전체의 반영은 한 트랜잭션으로 커밋
+    # 행마다 존재 여부를 조회하지 않고 임시 테이블에 모은 뒤 인덱스 조인으로 한 번에 처리
+    # 반환: {'inserted': 추가, 'updated': 갱신, 'skipped': 건너뜀(파일 안 중복 포함)}
+    path = get_pool().path
+    table = f'import_staging_{next(_staging_ids)}'
+    rows = iter(events)
+    staged = 0
+    merged = False
+    previous = None
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if previous is not None:
+                staged += previous.result()
+            if not batch:
+                break
+            previous = submit_write(_stage_batch, table, batch)
+        if not staged:
+            return {'inserted': 0, 'updated': 0, 'skipped': 0}
+        inserted, updated = _write(_merge_staged, table, on_commit=lambda _: _notify_reset(path))
+        merged = True
+    finally:
+        if not merged:
+            _write(_drop_staged, table)
+    return {'inserted': inserted, 'updated': updated, 'skipped': staged - inserted - updated}
+
+@cached_query
+@traced
 def get_all_events():
-    conn = sqlite3.connect('calendar.db')
-    df = pd.read_sql_query("SELECT * FROM events", conn)
-    conn.close()
-    return df
-
-def delete_event(event_id):
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('DELETE FROM events WHERE id = ?', (event_id,))
-    conn.commit()
-    conn.close()
-
-def update_event(event_id, title, start_date, end_date, color, description):
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('''
-        UPDATE events 
+    with connect() as conn:
+        return pd.read_sql_query("SELECT * FROM events", conn)
+
+@cached_query
+@traced
+def get_events_in_range(start, end, contained=False):
+    # 기본: [start, end] 기간과 하루라도 겹치는 일정
+    # contained=True: 기간 안에 완전히 포함되는 일정만
+    # start/end 중 None인 쪽은 제한하지 않음
+    where, params = _date_clauses(start, end, contained)
+    # 정렬도 비교에 쓰는 컬럼으로 해야 같은 인덱스 하나로 조회와 정렬을 처리함
+    query = (
+        'SELECT * FROM events'
+        + (' WHERE ' + ' AND '.join(where) if where else '')
+        + f' ORDER BY {_date_columns()[0]}'
+    )
+    with connect() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+def _fts_phrase(keyword):
+    # 키워드 전체를 하나의 구문으로 검색 (부분 문자열 일치)
+    return '"' + keyword.replace('"', '""') + '"'
+
+def _like_pattern(keyword):
+    # LIKE 와일드카드 문자를 이스케이프한 부분 일치 패턴
+    return '%' + keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def _keyword_filter(keyword):
+    # 제목/설명 키워드 조건 (WHERE 절 조각, 파라미터)
+    if len(keyword) >= FTS_MIN_KEYWORD:
+        return 'id IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)', [_fts_phrase(keyword)]
+    pattern = _like_pattern(keyword)
+    return "(title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\')", [pattern, pattern]
+
+def _event_filters(start=None, end=None, keyword=None, color=None, ids=None):
+    # 목록 조회/내보내기/일괄 변경 공통 조건 (WHERE 절 조각 목록, 파라미터 목록)
+    # start/end: 기간 안에 포함되는 일정만, keyword: 제목/설명 검색, color: 색상 코드, ids: id 목록
+    where, params = _date_clauses(start, end, contained=True)
+    if keyword:
+        clause, keyword_params = _keyword_filter(keyword)
+        where.append(clause)
+        params.extend(keyword_params)
+    if color is not None:
+        where.append('color = ?')
+        params.append(color)
+    if ids is not None:
+        where.append('id IN (SELECT value FROM json_each(?))')
+        params.append(json.dumps([int(i) for i in ids]))
+    return where, params
+
+@cached_query
+@traced
+def search_events(keyword, start, end, contained=True, limit=None):
+    # 제목/설명 키워드 검색 + 기간 필터를 한 번의 쿼리로 처리
+    # 결과는 관련도순(rank가 작을수록 관련도 높음, 제목 일치에 가중치)
+    # start/end 중 None인 쪽은 제한하지 않음
+    date_where, date_params = _date_clauses(start, end, contained, alias='e.')
+    date_filter = ''.join(f' AND {clause}' for clause in date_where)
+    date_params = tuple(date_params)
+
+    if len(keyword) >= FTS_MIN_KEYWORD:
+        query = f'''
+            SELECT e.*, bm25(events_fts, 10.0, 1.0) AS rank
+            FROM events_fts
+            JOIN events e ON e.id = events_fts.rowid
+            WHERE events_fts MATCH ?{date_filter}
+            ORDER BY rank
+        '''
+        params = (_fts_phrase(keyword),) + date_params
+    else:
+        # 2글자 이하는 trigram으로 색인되지 않으므로 LIKE로 검색
+        pattern = _like_pattern(keyword)
+        query = f'''
+            SELECT e.*, CASE WHEN e.title LIKE ? ESCAPE '\\' THEN 0 ELSE 1 END AS rank
+            FROM events e
+            WHERE (e.title LIKE ? ESCAPE '\\' OR e.description LIKE ? ESCAPE '\\'){date_filter}
+            ORDER BY rank, e.start_date
+        '''
+        params = (pattern, pattern, pattern) + date_params
+    if limit is not None:
+        query += ' LIMIT ?'
+        params += (limit,)
+    with connect() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+@cached_query
+@traced
+def query_events(start=None, end=None, keyword=None, sort_by='start_date', ascending=True,
+                 page_size=PAGE_SIZE, after=None):
+    # 필터/정렬/페이지 크기를 SQL에서 처리하는 키셋 페이지네이션 목록 조회
+    # start/end: 기간 안에 포함되는 일정만, keyword: 제목/설명 검색
+    # after: 이전 페이지 마지막 행의 (정렬값, id), 첫 페이지는 None
+    # 반환: (현재 페이지 DataFrame, 조건에 맞는 전체 건수, 다음 페이지 커서 또는 None)
+    if sort_by not in SORT_COLUMNS:
+        raise ValueError(f"정렬할 수 없는 컬럼입니다: {sort_by}")
+
+    where, params = _event_filters(start, end, keyword)
+    order = 'ASC' if ascending else 'DESC'
+    page_where, page_params = list(where), list(params)
+    if after is not None:
+        page_where.append(f"({sort_by}, id) {'>' if ascending else '<'} (?, ?)")
+        page_params.extend(after)
+
+    count_query = 'SELECT COUNT(*) FROM events' + (' WHERE ' + ' AND '.join(where) if where else '')
+    page_query = (
+        'SELECT * FROM events'
+        + (' WHERE ' + ' AND '.join(page_where) if page_where else '')
+        + f' ORDER BY {sort_by} {order}, id {order} LIMIT ?'
+    )
+    with connect() as conn:
+        total = conn.execute(count_query, params).fetchone()[0]
+        # 다음 페이지가 있는지 확인하기 위해 한 행 더 조회
+        page_df = pd.read_sql_query(page_query, conn, params=page_params + [page_size + 1])
+
+    next_cursor = None
+    if len(page_df) > page_size:
+        page_df = page_df.iloc[:page_size]
+        last = page_df.iloc[-1]
+        next_cursor = (last[sort_by], int(last['id']))
+    return page_df, total, next_cursor
+
+def iter_events(start=None, end=None, keyword=None, columns=EXPORT_COLUMNS,
+                chunk_size=EXPORT_CHUNK_SIZE):
+    # 조건에 맞는 일정을 chunk_size 행씩 튜플 리스트로 전달 (전체를 메모리에 올리지 않음)
+    # 반복이 끝날 때까지 연결 하나를 사용하며, WAL 모드라 쓰기를 막지 않음
+    where, params = _event_filters(start, end, keyword)
+    query = (
+        f"SELECT {', '.join(columns)} FROM events"
+        + (' WHERE ' + ' AND '.join(where) if where else '')
+        + ' ORDER BY start_date, id'
+    )
+    with connect() as conn:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+@cached_query
+@traced
+def get_date_bounds():
+    # 가장 이른 시작일과 가장 늦은 종료일 'YYYY-MM-DD' (인덱스만 사용), 일정이 없으면 (None, None)
+    # 정수 일수 컬럼으로 구하므로 해석하지 못하는 날짜('YYYY/MM/DD' 등, 일수가 NULL)는 건너뜀
+    with connect() as conn:
+        return conn.execute('''
+            SELECT date((SELECT MIN(start_day) FROM events) + 2440587.5),
+                   date((SELECT MAX(end_day) FROM events) + 2440587.5)
+        ''').fetchone()
+
+@cached_query
+@traced
+def get_event_stats(today):
+    # 현황 화면용 통계 (요약 테이블만 읽으므로 일정 수와 관계없이 일정한 시간)
+    # 예정/지난 일정은 시작일 기준이며, 이번 달만 인덱스로 today 전후를 나눠 셈
+    this_month = _to_date_str(today)[:7]
+    with connect() as conn:
+        stats_df = pd.read_sql_query(
+            'SELECT month, color, event_count, total_days FROM event_stats ORDER BY month, color', conn
+        )
+        month_start = _to_day_number(f'{this_month}-01')
+        before_today = conn.execute(
+            'SELECT COUNT(*) FROM events WHERE start_day >= ? AND start_day < ?',
+            (month_start, _to_day_number(today))
+        ).fetchone()[0]
+    total = int(stats_df['event_count'].sum())
+    past = int(stats_df.loc[stats_df['month'] < this_month, 'event_count'].sum()) + before_today
+    by_month = stats_df.groupby('month')[['event_count', 'total_days']].sum()
+    by_color = stats_df.groupby('color')[['event_count', 'total_days']].sum().sort_values('event_count', ascending=False)
+    return {
+        'total': total,
+        'average_days': stats_df['total_days'].sum() / total if total else 0.0,
+        'past': past,
+        'upcoming': total - past,
+        'by_month': by_month,
+        'by_color': by_color,
+    }
+
+@traced
+def get_events_by_ids(ids):
+    # id 목록에 해당하는 일정 (ids 순서 유지, interval_index 조회 결과를 행으로 바꿀 때 사용)
+    with connect() as conn:
+        return pd.read_sql_query('''
+            SELECT e.* FROM json_each(?) AS j
+            JOIN events AS e ON e.id = j.value
+            ORDER BY j.key
+        ''', conn, params=(json.dumps([int(i) for i in ids]),))
+
+def _delete_row(conn, event_id):
+    conn.execute('DELETE FROM events WHERE id = ?', (event_id,))
+
+@traced
+def delete_event(event_id, wait=True):
+    path = get_pool().path
+    return _write(
+        _delete_row, event_id,
+        on_commit=lambda _: _notify_write(path, 'delete', event_id),
+        wait=wait
+    )
+
+def _update_row(conn, event_id, title, start_date, end_date, color, description):
+    conn.execute('''
+        UPDATE events
         SET title = ?, start_date = ?, end_date = ?, color = ?, description = ?
         WHERE id = ?
     ''', (title, start_date, end_date, color, description, event_id))
-    conn.commit()
-    conn.close()
+
+@traced
+def update_event(event_id, title, start_date, end_date, color, description, wait=True):
+    path = get_pool().path
+    return _write(
+        _update_row, event_id, title, start_date, end_date, color, description,
+        on_commit=lambda _: _notify_write(path, 'update', event_id, start_date, end_date),
+        wait=wait
+    )
+
+def _update_dates(conn, rows):
+    conn.executemany('UPDATE events SET start_date = ?, end_date = ? WHERE id = ?', rows)
+    return len(rows)
+
+@traced
+def update_event_dates(changes, wait=True):
+    # changes: (event_id, start_date, end_date) 목록, 한 트랜잭션으로 반영하고 반영한 개수를 반환
+    rows = [(start_date, end_date, int(event_id)) for event_id, start_date, end_date in changes]
+    path = get_pool().path
+
+    def notify(count):
+        for start_date, end_date, event_id in rows:
+            _notify_write(path, 'update', event_id, start_date, end_date)
+
+    return _write(_update_dates, rows, on_commit=notify, wait=wait)
+
+# 일괄 수정에서 바꿀 수 있는 컬럼
+UPDATE_COLUMNS = ('title', 'start_date', 'end_date', 'color', 'description')
+
+def _batch_filters(filters):
+    where, params = _event_filters(**filters)
+    if not where:
+        # 조건 없이 전체를 바꾸는 실수를 막음 (전체 삭제는 delete_all_events 사용)
+        raise ValueError("일괄 변경에는 id 목록이나 조건이 하나 이상 필요합니다.")
+    return ' AND '.join(where), params
+
+def _notify_rows(path, action, rows):
+    # 너무 많으면 행마다 알리지 않고 다시 만들도록 알림
+    if len(rows) > NOTIFY_ROW_LIMIT:
+        _notify_reset(path)
+        return
+    for row in rows:
+        _notify_write(path, action, *row)
+
+def _write_rows(job, *args, action, wait=True):
+    # job은 RETURNING으로 바뀐 행을 돌려줌, 커밋 뒤 행마다 알리고 바뀐 행 수를 결과로 사용
+    path = get_pool().path
+    future = Future()
+
+    def finish(inner):
+        if inner.exception() is not None:
+            future.set_exception(inner.exception())
+        else:
+            future.set_result(len(inner.result()))
+
+    submit_write(
+        job, *args,
+        on_commit=lambda rows: _notify_rows(path, action, rows)
+    ).add_done_callback(finish)
+    return future.result() if wait else future
+
+def _delete_matching(conn, where, params):
+    return conn.execute(f'DELETE FROM events WHERE {where} RETURNING id', params).fetchall()
+
+@traced
+def delete_events(ids=None, start=None, end=None, keyword=None, color=None, wait=True):
+    # id 목록 또는 조건(기간 안에 포함/검색어/색상)에 맞는 일정을 한 문장으로 삭제하고 삭제한 개수를 반환
+    where, params = _batch_filters(dict(ids=ids, start=start, end=end, keyword=keyword, color=color))
+    result = _write_rows(_delete_matching, where, params, action='delete', wait=wait)
+    schedule_vacuum()
+    return result
+
+def _update_matching(conn, assignments, values, where, params):
+    return conn.execute(
+        f'UPDATE events SET {assignments} WHERE {where} RETURNING id, start_date, end_date',
+        values + params
+    ).fetchall()
+
+@traced
+def update_events(changes, ids=None, start=None, end=None, keyword=None, color=None, wait=True):
+    # changes: {컬럼: 값} (UPDATE_COLUMNS 중), 조건에 맞는 일정을 한 문장으로 수정하고 수정한 개수를 반환
+    unknown = set(changes) - set(UPDATE_COLUMNS)
+    if not changes or unknown:
+        raise ValueError(f"수정할 수 없는 컬럼: {sorted(unknown)}")
+    assignments = ', '.join(f'{column} = ?' for column in changes)
+    where, params = _batch_filters(dict(ids=ids, start=start, end=end, keyword=keyword, color=color))
+    return _write_rows(
+        _update_matching, assignments, list(changes.values()), where, params,
+        action='update', wait=wait
+    )
+
+class WriteQueue:
+    # 일정 날짜 변경(캘린더 드래그/크기 조절)을 모아 두었다가 한 번에 저장
+    # 같은 일정을 여러 번 옮기면 마지막 위치만 남김
+    # 만들 때의 프로젝트에 저장하므로 다른 프로젝트를 보는 중(또는 위젯 콜백)에 flush해도 섞이지 않음
+    # flush_after(초)를 주면 첫 변경 뒤 그 시간이 지났을 때 타이머 스레드가 저장
+    # (브라우저 탭을 닫아 rerun이 더 없어도 저장됨)
+    def __init__(self, project=None, flush_after=None):
+        self.project = project or current_project()
+        self.flush_after = flush_after
+        self._pending = OrderedDict()   # id → (start_date, end_date)
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending)
+
+    def put(self, event_id, start_date, end_date):
+        with self._lock:
+            self._pending[int(event_id)] = (start_date, end_date)
+            self._start_timer()
+
+    def pending(self):
+        with self._lock:
+            return dict(self._pending)
+
+    def discard(self):
+        with self._lock:
+            self._pending.clear()
+            self._cancel_timer()
+
+    def _start_timer(self):
+        # self._lock을 잡은 상태에서 호출, 이미 예약된 저장이 있으면 그대로 둠
+        if self.flush_after is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.flush_after, self._timed_flush)
+        self._timer.name = 'write-queue-flush'
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            # 저장하지 못한 변경은 flush가 대기열에 되돌리고 타이머를 다시 예약함
+            logger.exception('대기 중인 일정 변경 자동 저장 실패 (%s초 뒤 다시 시도)', self.flush_after)
+
+    def flush(self):
+        # 모인 변경을 한 트랜잭션으로 저장하고 저장한 개수를 반환
+        # 실패하면 그 사이 새로 들어온 변경은 그대로 두고 나머지를 다시 대기열에 넣음
+        with self._lock:
+            changes = [(event_id, start, end) for event_id, (start, end) in self._pending.items()]
+            self._pending.clear()
+            self._cancel_timer()
+        if not changes:
+            return 0
+        try:
+            with project_scope(self.project):
+                return update_event_dates(changes)
+        except Exception:
+            with self._lock:
+                for event_id, start, end in changes:
+                    if event_id not in self._pending:
+                        self._pending[event_id] = (start, end)
+                self._start_timer()
+            raise
 
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    create_database()
@@ -0,0 +1,151 @@
+# export.py
+# 일정 내보내기 (SQLite에서 청크 단위로 읽어 CSV/엑셀/Parquet/Arrow 파일에 바로 기록)
+# openpyxl/pyarrow는 해당 형식으로 내보낼 때 처음 import (색상 이름만 쓰는 페이지의 시작 시간 단축)
+import csv
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from db import iter_events, EXPORT_COLUMNS
+from timing import traced
+
+# 색상 코드 → 색상 이름
+COLOR_NAMES = {
+    "#FF6B6B": "빨간색",
+    "#45B7D1": "파란색",
+    "#4ECDC4": "초록색",
+    "#845EC2": "보라색",
+    "#FF9671": "주황색"
+}
+DEFAULT_COLOR_NAME = "빨간색"
+
+FORMATS = {
+    'xlsx': {
+        'label': '엑셀',
+        'file_name': 'events.xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    },
+    'csv': {
+        'label': 'CSV',
+        'file_name': 'events.csv',
+        'mime': 'text/csv',
+    },
+    'parquet': {
+        'label': 'Parquet',
+        'file_name': 'events.parquet',
+        'mime': 'application/vnd.apache.parquet',
+    },
+    'arrow': {
+        'label': 'Arrow IPC',
+        'file_name': 'events.arrow',
+        'mime': 'application/vnd.apache.arrow.file',
+    },
+}
+
+def arrow_schema():
+    # Parquet/Arrow 파일의 컬럼 형식 (날짜는 다른 시스템과 주고받기 쉽도록 문자열 'YYYY-MM-DD')
+    import pyarrow as pa
+    return pa.schema([(column, pa.string()) for column in EXPORT_COLUMNS])
+
+def map_colors(values, mapping, default):
+    # 색상 코드 ↔ 이름 변환을 컬럼 전체에 한 번에 적용 (매핑에 없는 값은 default)
+    # 해시 인덱스로 위치를 찾은 뒤 값 배열에서 꺼내므로 행마다 dict 조회를 하지 않음
+    targets = np.array(list(mapping.values()) + [default], dtype=object)
+    positions = pd.Index(list(mapping)).get_indexer(values)
+    return targets[positions]   # 못 찾은 값(-1)은 마지막의 default
+
+def iter_export_rows(**filters):
+    # 내보낼 행을 하나씩 전달 (색상은 이름으로 변환)
+    color_index = EXPORT_COLUMNS.index('color')
+    for rows in iter_events(**filters):
+        for row in rows:
+            row = list(row)
+            row[color_index] = COLOR_NAMES.get(row[color_index], DEFAULT_COLOR_NAME)
+            yield row
+
+def write_csv(path, **filters):
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함 UTF-8로 저장
+    count = 0
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in iter_export_rows(**filters):
+            writer.writerow(row)
+            count += 1
+    return count
+
+def write_excel(path, **filters):
+    # write-only 모드는 행을 바로 파일로 흘려보내므로 메모리 사용량이 일정
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Events')
+    ws.append(EXPORT_COLUMNS)
+    count = 0
+    for row in iter_export_rows(**filters):
+        ws.append(row)
+        count += 1
+    wb.save(path)
+    return count
+
+def iter_export_batches(**filters):
+    # 청크를 색상 이름까지 변환한 Arrow RecordBatch로 전달
+    import pyarrow as pa
+    schema = arrow_schema()
+    color_index = EXPORT_COLUMNS.index('color')
+    for rows in iter_events(**filters):
+        columns = [np.array(column, dtype=object) for column in zip(*rows)]
+        columns[color_index] = map_colors(columns[color_index], COLOR_NAMES, DEFAULT_COLOR_NAME)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=pa.string()) for column in columns],
+            schema=schema
+        )
+
+def write_parquet(path, **filters):
+    # 청크마다 row group 하나씩 기록
+    import pyarrow.parquet as pq
+    count = 0
+    with pq.ParquetWriter(path, arrow_schema(), compression='zstd') as writer:
+        for batch in iter_export_batches(**filters):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+def write_arrow(path, **filters):
+    # Arrow IPC 파일 형식 (Feather v2와 같음)
+    import pyarrow as pa
+    count = 0
+    with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(sink, arrow_schema()) as writer:
+        for batch in iter_export_batches(**filters):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+WRITERS = {
+    'xlsx': write_excel,
+    'csv': write_csv,
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+}
+
+@traced
+def export_to_tempfile(fmt, **filters):
+    # 임시 파일에 내보내고 (파일 경로, 행 수) 반환, 파일 삭제는 호출한 쪽 책임
+    fd, path = tempfile.mkstemp(prefix='events_', suffix=f'.{fmt}')
+    os.close(fd)
+    try:
+        count = WRITERS[fmt](path, **filters)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, count
+
+@traced
+def export_to_bytes(fmt, **filters):
+    # 파일 내용을 메모리로 읽어 (bytes, 행 수) 반환, 임시 파일은 바로 삭제
+    # (세션이 끝난 뒤 디스크에 내보내기 파일이 남지 않도록 st.download_button에는 이 값을 넘김)
+    path, count = export_to_tempfile(fmt, **filters)
+    try:
+        with open(path, 'rb') as f:
+            return f.read(), count
+    finally:
+        os.remove(path)
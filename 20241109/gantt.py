@@ -0,0 +1,178 @@
+# gantt.py
+# 간트 차트 데이터 준비 및 렌더링 (컬럼 단위 벡터 연산)
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from occupancy import parse_event_dates
+from conflicts import daily_load
+from timing import traced
+
+DEFAULT_COLOR = "#FF6B6B"
+CONFLICT_COLOR = "#D62728"  # 충돌 일정 테두리/강조선
+
+# 렌더링 방식 전환 기준 (일정 수)
+MAX_BAR_TASKS = 300         # 이하: 막대(go.Bar)
+MAX_WEBGL_TASKS = 20000     # 이하: WebGL 선분(go.Scattergl), 초과: 일별 집계
+
+ROW_HEIGHT = 28
+MIN_HEIGHT = 400
+MAX_HEIGHT = 1200
+
+MODES = {
+    'auto': '자동',
+    'bar': '막대',
+    'webgl': 'WebGL',
+    'aggregate': '일별 집계',
+}
+
+@traced
+def prepare_gantt_data(events_df, conflict_counts=None):
+    # 간트 차트용 컬럼 준비 (행 단위 반복 없이 한 번에 변환)
+    # conflict_counts: 일정별 겹치는 일정 수 (conflicts.analyze_schedule 결과, events_df 인덱스)
+    start, end = parse_event_dates(events_df)
+    start = pd.Series(start.astype('datetime64[ns]'), index=events_df.index)
+    # 종료일 당일까지 막대가 보이도록 다음 날 0시를 끝으로 사용
+    finish = pd.Series((end + np.timedelta64(1, 'D')).astype('datetime64[ns]'), index=events_df.index)
+    return pd.DataFrame({
+        'Task': events_df['title'].astype(str),
+        'Start': start,
+        'Finish': finish,
+        'StartDate': events_df['start_date'],
+        'EndDate': events_df['end_date'],
+        'Color': events_df['color'].fillna(DEFAULT_COLOR),
+        'Description': events_df['description'].fillna(''),
+        'Conflicts': 0 if conflict_counts is None else conflict_counts.reindex(events_df.index, fill_value=0),
+    }).sort_values('Start', kind='stable').reset_index(drop=True)
+
+def resolve_mode(task_count, mode='auto'):
+    # 자동 모드에서는 일정 수에 따라 렌더링 방식 선택
+    if mode != 'auto':
+        return mode
+    if task_count <= MAX_BAR_TASKS:
+        return 'bar'
+    if task_count <= MAX_WEBGL_TASKS:
+        return 'webgl'
+    return 'aggregate'
+
+def _figure_height(row_count):
+    return int(min(max(MIN_HEIGHT, 120 + row_count * ROW_HEIGHT), MAX_HEIGHT))
+
+def _bar_figure(gantt_df):
+    duration_ms = (gantt_df['Finish'] - gantt_df['Start']).dt.total_seconds() * 1000
+    fig = go.Figure(go.Bar(
+        base=gantt_df['Start'],
+        x=duration_ms,
+        y=gantt_df['Task'],
+        orientation='h',
+        marker_color=gantt_df['Color'],
+        # 다른 일정과 겹치는 막대는 테두리로 강조
+        marker_line_color=CONFLICT_COLOR,
+        marker_line_width=np.where(gantt_df['Conflicts'] > 0, 2, 0),
+        customdata=gantt_df[['StartDate', 'EndDate', 'Description', 'Conflicts']],
+        hovertemplate='<b>%{y}</b><br>%{customdata[0]} ~ %{customdata[1]}<br>%{customdata[2]}'
+                      '<br>겹치는 일정 %{customdata[3]}건<extra></extra>'
+    ))
+    fig.update_xaxes(type='date')
+    # 먼저 시작하는 일정이 위에 오도록
+    fig.update_yaxes(autorange='reversed', categoryorder='array', categoryarray=gantt_df['Task'].unique())
+    return fig, gantt_df['Task'].nunique()
+
+def _webgl_figure(gantt_df):
+    # 일정마다 [시작, 끝, 끊김] 세 점으로 선분을 그리고, 색상별로 trace 하나씩 사용
+    rows, _ = pd.factorize(gantt_df['Task'])
+    fig = go.Figure()
+
+    def add_segments(idx, color, width):
+        count = len(idx)
+        x = np.empty(count * 3, dtype='datetime64[ns]')
+        x[0::3] = gantt_df['Start'].to_numpy()[idx]
+        x[1::3] = gantt_df['Finish'].to_numpy()[idx]
+        x[2::3] = np.datetime64('NaT')
+        y = np.empty(count * 3, dtype=float)
+        y[0::3] = rows[idx]
+        y[1::3] = rows[idx]
+        y[2::3] = np.nan
+        fig.add_trace(go.Scattergl(
+            x=x,
+            y=y,
+            mode='lines',
+            line=dict(color=color, width=width),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+
+    for color, idx in gantt_df.groupby('Color', sort=False).indices.items():
+        add_segments(idx, color, 6)
+    # 충돌 일정은 가운데에 가는 강조선을 겹쳐 그림
+    conflicted = np.flatnonzero(gantt_df['Conflicts'].to_numpy() > 0)
+    if len(conflicted):
+        add_segments(conflicted, CONFLICT_COLOR, 2)
+    row_count = rows.max() + 1 if len(rows) else 0
+    fig.update_yaxes(autorange='reversed', showticklabels=False, title='일정')
+    return fig, row_count
+
+def daily_counts(gantt_df):
+    # 날짜별로 진행 중인 일정 수 (Finish는 종료 다음 날이므로 하루 빼서 계산)
+    start = gantt_df['Start'].to_numpy().astype('datetime64[D]')
+    end = gantt_df['Finish'].to_numpy().astype('datetime64[D]') - np.timedelta64(1, 'D')
+    return daily_load(start, end)
+
+def _aggregate_figure(gantt_df):
+    counts = daily_counts(gantt_df)
+    fig = go.Figure(go.Scatter(
+        x=counts.index,
+        y=counts.to_numpy(),
+        mode='lines',
+        line_shape='hv',
+        fill='tozeroy',
+        hovertemplate='%{x|%Y-%m-%d}<br>진행 중 일정 %{y}건<extra></extra>'
+    ))
+    fig.update_yaxes(title='진행 중 일정 수')
+    return fig, 0
+
+def build_load_strip(load, threshold=None):
+    # 일별 부하를 한 줄짜리 히트맵으로 표시 (threshold 이상인 날은 막대 위에 표시)
+    fig = go.Figure(go.Heatmap(
+        x=load.index,
+        y=['부하'],
+        z=[load.to_numpy()],
+        colorscale='YlOrRd',
+        colorbar=dict(title='일정 수', thickness=10),
+        hovertemplate='%{x|%Y-%m-%d}<br>진행 중 일정 %{z}건<extra></extra>'
+    ))
+    if threshold is not None:
+        busy = load[load >= threshold]
+        fig.add_trace(go.Scatter(
+            x=busy.index,
+            y=['부하'] * len(busy),
+            mode='markers',
+            marker=dict(symbol='triangle-down', color=CONFLICT_COLOR, size=8),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+    fig.update_layout(height=160, margin=dict(l=20, r=20, t=20, b=20))
+    fig.update_xaxes(type='date')
+    return fig
+
+@traced
+def build_gantt_figure(gantt_df, mode='auto'):
+    # mode: 'auto', 'bar', 'webgl', 'aggregate'
+    mode = resolve_mode(len(gantt_df), mode)
+    builders = {
+        'bar': _bar_figure,
+        'webgl': _webgl_figure,
+        'aggregate': _aggregate_figure,
+    }
+    fig, row_count = builders[mode](gantt_df)
+
+    # 차트 레이아웃 설정
+    fig.update_layout(
+        title='Project Schedule',
+        xaxis_title='Date',
+        height=_figure_height(row_count),
+        font=dict(size=10),
+        margin=dict(l=20, r=20, t=60, b=20)
+    )
+    fig.update_xaxes(showgrid=True)
+    fig.update_yaxes(showgrid=True)
+    return fig
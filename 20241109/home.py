@@ -1,31 +1,94 @@
 # home.py
 import streamlit as st
-from db import get_all_events, delete_all_events
+from db import get_event_stats, delete_all_events, get_cache_stats, create_project
+from interval_index import get_interval_index
+from export import COLOR_NAMES
+from timing import span, show_debug_panel
+from projects import select_project, set_session_project
 import datetime
 
 def main():
+    project = select_project()
     st.title("프로젝트 일정 관리")
+    st.caption(f"📁 {project} 프로젝트")
     
     # 탭 생성
     tab1, tab2 = st.tabs(["📊 현황", "⚙️ 관리"])
     
     with tab1:
-        # 데이터 통계
-        events_df = get_all_events()
-        if not events_df.empty:
+        # 데이터 통계 (요약 테이블 기반)
+        today = datetime.date.today()
+        stats = get_event_stats(today)
+        if stats['total'] > 0:
             st.subheader("📈 일정 통계")
-            st.metric("전체 일정 수", len(events_df))
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("전체 일정 수", f"{stats['total']:,}")
+            col2.metric("평균 기간", f"{stats['average_days']:.1f}일")
+            col3.metric("예정 일정", f"{stats['upcoming']:,}")
+            col4.metric("지난 일정", f"{stats['past']:,}")
+            
+            # 진행 중 일정 수는 기간 인덱스로 조회
+            index = get_interval_index()
+            week_start = today - datetime.timedelta(days=today.weekday())
+            col1, col2 = st.columns(2)
+            col1.metric("오늘 진행 중", len(index.at(today)))
+            col2.metric("이번 주 일정", index.count_overlapping(week_start, week_start + datetime.timedelta(days=6)))
+            
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.caption("월별 일정 수 (시작일 기준)")
+                st.bar_chart(stats['by_month']['event_count'].rename('일정 수'))
+            with col2:
+                st.caption("색상별 일정")
+                by_color = stats['by_color']
+                st.dataframe(
+                    by_color.assign(
+                        name=[COLOR_NAMES.get(color, color or '없음') for color in by_color.index],
+                        average_days=by_color['total_days'] / by_color['event_count']
+                    )[['name', 'event_count', 'average_days']],
+                    column_config={
+                        'name': '색상',
+                        'event_count': '일정 수',
+                        'average_days': st.column_config.NumberColumn('평균 기간(일)', format="%.1f")
+                    },
+                    hide_index=True
+                )
         else:
             st.info("등록된 일정이 없습니다.")
+        
+        # 조회 캐시 상태
+        with st.expander("🗄️ 조회 캐시 상태"):
+            stats = get_cache_stats()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("적중", stats['hits'])
+            col2.metric("미스", stats['misses'])
+            col3.metric("적중률", f"{stats['hit_rate']:.0%}")
+            col4.metric("보관 항목", f"{stats['size']}/{stats['maxsize']}")
     
     with tab2:
+        st.subheader("📁 새 프로젝트")
+        col1, col2 = st.columns([2,1])
+        with col1:
+            new_project = st.text_input(
+                "프로젝트 이름",
+                label_visibility="collapsed",
+                placeholder="프로젝트 이름 입력"
+            )
+        with col2:
+            if st.button("프로젝트 만들기"):
+                try:
+                    set_session_project(create_project(new_project))
+                    st.rerun()
+                except ValueError as e:
+                    st.error(str(e))
+        
         st.subheader("⚠️ 데이터 관리")
         
         # 경고 메시지
-        st.warning("""
+        st.warning(f"""
         주의사항
         - 이 작업은 되돌릴 수 없습니다!
-        - 모든 일정 데이터가 영구적으로 삭제됩니다.
+        - '{project}' 프로젝트의 모든 일정 데이터가 영구적으로 삭제됩니다. (다른 프로젝트는 그대로 유지)
         - 삭제 전 필요한 데이터는 백업해주세요.
         """)
         
@@ -41,17 +104,19 @@ def main():
             )
         
         with col2:
-            if st.button("전체 데이터 삭제", type="primary"):
+            if st.button(f"'{project}' 데이터 삭제", type="primary"):
                 if delete_code == "1035":
                     try:
                         delete_all_events()
-                        st.success("✅ 모든 데이터가 삭제되었습니다!")
+                        st.success(f"✅ '{project}' 프로젝트의 데이터가 삭제되었습니다!")
                         st.balloons()
-                        st.experimental_rerun()
+                        st.rerun()
                     except Exception as e:
                         st.error(f"오류 발생: {str(e)}")
                 else:
                     st.error("올바른 코드를 입력해주세요.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with span('page.home'):
+        main()
+    show_debug_panel()
\ No newline at end of file
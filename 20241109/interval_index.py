@@ -0,0 +1,207 @@
+# interval_index.py
+# 일정 기간 인덱스 ("이 날/이 기간에 진행 중인 일정" 조회)
+# 기간 길이별로 묶은 시작일 정렬 배열을 사용해 O(log n + k)에 가깝게 조회하고,
+# 일정 추가/수정/삭제 시에는 전체를 다시 만들지 않고 해당 항목만 반영
+import threading
+from datetime import date
+import numpy as np
+import db
+
+def to_day(value):
+    # date/문자열/np.datetime64를 1970-01-01 기준 일수로 변환
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[D]').astype(np.int64))
+    return db._to_day_number(value)
+
+def _stored_day(value):
+    # DB에 저장된 값의 일수 (start_day/end_day와 같은 규칙)
+    # julianday()는 'YYYY-MM-DD'로 시작하는 문자열만 해석하므로 그 밖의 문자열은 ValueError (DB에서는 NULL)
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return to_day(value)
+
+class _Bucket:
+    # 기간 길이가 비슷한 일정 묶음 (시작일 오름차순 정렬)
+    def __init__(self, starts, ends, ids):
+        order = np.argsort(starts, kind='stable')
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.ids = ids[order]
+        self.max_length = int((self.ends - self.starts).max()) if len(self.starts) else 0
+
+    def insert(self, start, end, event_id):
+        pos = int(np.searchsorted(self.starts, start, side='right'))
+        self.starts = np.insert(self.starts, pos, start)
+        self.ends = np.insert(self.ends, pos, end)
+        self.ids = np.insert(self.ids, pos, event_id)
+        self.max_length = max(self.max_length, end - start)
+
+    def remove(self, start, event_id):
+        lo = int(np.searchsorted(self.starts, start, side='left'))
+        hi = int(np.searchsorted(self.starts, start, side='right'))
+        pos = lo + int(np.flatnonzero(self.ids[lo:hi] == event_id)[0])
+        self.starts = np.delete(self.starts, pos)
+        self.ends = np.delete(self.ends, pos)
+        self.ids = np.delete(self.ids, pos)
+
+    def overlapping(self, start, end):
+        # 시작일이 [start - 최대 길이, end] 안에 있는 후보만 보고 종료일로 거름
+        lo = int(np.searchsorted(self.starts, start - self.max_length, side='left'))
+        hi = int(np.searchsorted(self.starts, end, side='right'))
+        mask = self.ends[lo:hi] >= start
+        return self.starts[lo:hi][mask], self.ids[lo:hi][mask]
+
+def _bucket_key(length):
+    # 기간 길이(일)를 2의 거듭제곱 단위로 묶음: 0, 1, 2~3, 4~7, ...
+    return int(length).bit_length()
+
+class IntervalIndex:
+    def __init__(self):
+        self._buckets = {}
+        self._spans = {}    # id → (시작 일수, 종료 일수)
+
+    @classmethod
+    def from_arrays(cls, ids, starts, ends):
+        index = cls()
+        ids = np.asarray(ids, dtype=np.int64)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        # frexp의 지수 = 정수의 bit_length (0은 0)
+        keys = np.frexp(np.maximum(ends - starts, 0).astype(np.float64))[1]
+        for key in np.unique(keys):
+            mask = keys == key
+            index._buckets[int(key)] = _Bucket(starts[mask], ends[mask], ids[mask])
+        index._spans = dict(zip(ids.tolist(), zip(starts.tolist(), ends.tolist())))
+        return index
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __contains__(self, event_id):
+        return event_id in self._spans
+
+    def add(self, event_id, start, end):
+        start, end = to_day(start), to_day(end)
+        if event_id in self._spans:
+            self.remove(event_id)
+        key = _bucket_key(max(end - start, 0))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = _Bucket(np.array([start]), np.array([end]), np.array([event_id]))
+        else:
+            bucket.insert(start, end, event_id)
+        self._spans[event_id] = (start, end)
+
+    def remove(self, event_id):
+        span = self._spans.pop(event_id, None)
+        if span is None:
+            return
+        start, end = span
+        self._buckets[_bucket_key(max(end - start, 0))].remove(start, event_id)
+
+    def update(self, event_id, start, end):
+        self.add(event_id, start, end)
+
+    def overlapping(self, start, end):
+        # [start, end] 기간과 하루라도 겹치는 일정 id (시작일순)
+        start, end = to_day(start), to_day(end)
+        found_starts, found_ids = [], []
+        for bucket in self._buckets.values():
+            starts, ids = bucket.overlapping(start, end)
+            found_starts.append(starts)
+            found_ids.append(ids)
+        if not found_ids:
+            return np.array([], dtype=np.int64)
+        starts = np.concatenate(found_starts)
+        ids = np.concatenate(found_ids)
+        return ids[np.argsort(starts, kind='stable')]
+
+    def at(self, day):
+        # 해당 날짜에 진행 중인 일정 id
+        return self.overlapping(day, day)
+
+    def count_overlapping(self, start, end):
+        return len(self.overlapping(start, end))
+
+def load_interval_index(conn):
+    # events 테이블 전체로 인덱스 생성 (정수 일수 컬럼만 읽음)
+    # 날짜를 해석하지 못한 행(일수가 NULL)은 기간 조회에 나오지 않으므로 인덱스에서도 뺌
+    rows = conn.execute(
+        'SELECT id, start_day, end_day FROM events WHERE start_day IS NOT NULL AND end_day IS NOT NULL'
+    ).fetchall()
+    data = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return IntervalIndex.from_arrays(data[:, 0], data[:, 1], data[:, 2])
+
+class _SharedIndex:
+    # DB 파일별로 프로세스에서 하나만 두는 인덱스
+    # 이 프로세스의 단건 추가/수정/삭제는 db 쓰기 알림으로 바로 반영하고,
+    # 그 밖의 변경(일괄 등록/전체 삭제, 다른 프로세스)은 데이터 버전이 달라진 것을 보고 다시 만듦
+    # 알림을 반영할 때는 그 트랜잭션 직전의 데이터 버전이 인덱스의 버전과 같을 때만 제자리 갱신
+    # (같은 그룹 커밋 안의 다른 알림은 커밋 번호로 구분)
+    def __init__(self, path):
+        self.path = path
+        self.index = None
+        self.version = None
+        self.commit_id = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        pool = db.get_pool(self.path)
+        with self.lock:
+            version = pool.data_version()
+            if self.index is None or version != self.version:
+                with pool.connection() as conn:
+                    self.index = load_interval_index(conn)
+                self.version = version
+                self.commit_id = None
+            return self.index
+
+    def apply(self, action, event_id, start, end, commit_info):
+        version_before, commit_id = commit_info
+        pool = db.get_pool(self.path)
+        with self.lock:
+            if self.index is None:
+                return
+            # 통째 변경이거나 이 트랜잭션 전에 인덱스가 이미 뒤처져 있었으면 다음 get()에서 다시 만듦
+            if action == 'reset' or (commit_id != self.commit_id and version_before != self.version):
+                self.index = None
+                return
+            event_id = int(event_id)
+            # 인덱스에 없는 일정의 수정(날짜를 해석하지 못해 빠져 있던 일정 등)은 다시 만들어서 반영
+            if action == 'update' and event_id not in self.index:
+                self.index = None
+                return
+            if action in ('add', 'update'):
+                try:
+                    self.index.update(event_id, _stored_day(start), _stored_day(end))
+                except ValueError:
+                    self.index.remove(event_id)
+            elif action == 'delete':
+                self.index.remove(event_id)
+            self.version = pool.data_version()
+            self.commit_id = commit_id
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+def _shared_index(path=None):
+    path = db.get_pool(path).path
+    with _shared_lock:
+        shared = _shared.get(path)
+        if shared is None:
+            shared = _shared[path] = _SharedIndex(path)
+    return shared
+
+def get_interval_index():
+    # 현재 DB의 공유 인덱스 (처음 호출할 때 만들고 이후에는 변경분만 반영)
+    return _shared_index().get()
+
+def _on_write(path, action, event_id, start, end, commit_info):
+    with _shared_lock:
+        shared = _shared.get(path)
+    if shared is not None:
+        shared.apply(action, event_id, start, end, commit_info)
+
+db.add_write_listener(_on_write)
@@ -0,0 +1,52 @@
+# occupancy.py
+# 날짜별 일정 매핑 (한 달 단위)
+import calendar
+import numpy as np
+import pandas as pd
+
+def parse_event_dates(events_df):
+    # 일정의 시작/종료일을 datetime64[D] 배열로 반환
+    # DB에서 읽은 정수 일수 컬럼(start_day/end_day)이 있으면 문자열 파싱 없이 바로 변환
+    if all(col in events_df and events_df[col].dtype.kind in 'iu' for col in ('start_day', 'end_day')):
+        start = events_df['start_day'].to_numpy().astype('datetime64[D]')
+        end = events_df['end_day'].to_numpy().astype('datetime64[D]')
+        return start, end
+    start = pd.to_datetime(events_df['start_date']).to_numpy().astype('datetime64[D]')
+    end = pd.to_datetime(events_df['end_date']).to_numpy().astype('datetime64[D]')
+    return start, end
+
+def build_month_occupancy(events_df, year, month):
+    # 해당 월의 날짜(1일~말일)별로 걸쳐 있는 일정의 인덱스 라벨 목록을 반환
+    # 예: occupancy[29] → 29일에 진행 중인 일정들의 events_df 인덱스 (events_df 순서 유지)
+    days_in_month = calendar.monthrange(year, month)[1]
+    occupancy = {day: [] for day in range(1, days_in_month + 1)}
+    if events_df.empty:
+        return occupancy
+
+    first_day = np.datetime64(f"{year}-{month:02d}-01", 'D')
+    start, end = parse_event_dates(events_df)
+
+    # 월 경계로 잘라낸 일자 오프셋 (0 = 1일)
+    start_off = (start - first_day).astype(np.int64)
+    end_off = (end - first_day).astype(np.int64)
+    in_month = (start_off <= days_in_month - 1) & (end_off >= 0) & (start_off <= end_off)
+    if not in_month.any():
+        return occupancy
+
+    rows = np.flatnonzero(in_month)
+    start_off = np.clip(start_off[rows], 0, days_in_month - 1)
+    end_off = np.clip(end_off[rows], 0, days_in_month - 1)
+
+    # 각 일정을 (일정, 날짜) 쌍으로 펼침
+    lengths = end_off - start_off + 1
+    pair_rows = np.repeat(rows, lengths)
+    pair_days = np.repeat(start_off - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+    # 날짜순으로 안정 정렬 후 날짜별로 분할
+    order = np.argsort(pair_days, kind='stable')
+    pair_rows, pair_days = pair_rows[order], pair_days[order]
+    bounds = np.searchsorted(pair_days, np.arange(days_in_month + 1))
+    labels = events_df.index.to_numpy()
+    for offset in range(days_in_month):
+        occupancy[offset + 1] = labels[pair_rows[bounds[offset]:bounds[offset + 1]]].tolist()
+    return occupancy
@@ -2,8 +2,12 @@
 import streamlit as st
 from streamlit_calendar import calendar
 import datetime
-import sqlite3
+import numpy as np
 import pandas as pd
+from db import add_event, get_events_in_range, prefetch, WriteQueue
+from occupancy import parse_event_dates
+from timing import span, show_debug_panel
+from projects import select_project, session_project
 
 # 색상 정의
 COLOR_MAPPING = {
@@ -37,60 +41,134 @@ KOREAN_HOLIDAYS = [
     {"title": "성탄절", "date": "2025-12-25"}
 ]
 
-# DB 연결 함수
-def init_db():
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS events
-        (id INTEGER PRIMARY KEY AUTOINCREMENT,
-         title TEXT NOT NULL,
-         start_date DATE NOT NULL,
-         end_date DATE NOT NULL,
-         color TEXT,
-         description TEXT)
-    ''')
-    conn.commit()
-    conn.close()
-
-def add_event(title, start_date, end_date, color, description=""):
-    conn = sqlite3.connect('calendar.db')
-    c = conn.cursor()
-    c.execute('''
-        INSERT INTO events (title, start_date, end_date, color, description)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (title, start_date, end_date, color, description))
-    conn.commit()
-    conn.close()
-
-def get_all_events():
-    conn = sqlite3.connect('calendar.db')
-    events = pd.read_sql_query("SELECT * FROM events", conn)
-    conn.close()
+# 월 화면에 보이는 기간 (일요일 시작 6주)
+GRID_DAYS = 42
+# 현재 달 앞뒤로 미리 조회해 둘 달 수
+PREFETCH_MONTHS = 1
+# 드래그로 바꾼 일정은 모아 두었다가 첫 변경 뒤 이 시간(초)이 지나면 한 번에 저장
+EDIT_FLUSH_SECONDS = 5
+
+def _next_day(date_str):
+    return (datetime.date.fromisoformat(date_str) + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+
+def build_calendar_events(events_df):
+    # 캘린더 컴포넌트에 넘길 일정 목록 (컬럼 단위로 만든 뒤 한 번에 dict 목록으로 변환)
+    # FullCalendar의 종일 일정 end는 마지막 날의 다음 날이므로 종료일 + 1일을 넘김
+    _, end = parse_event_dates(events_df)
+    color = events_df['color']
+    return pd.DataFrame({
+        'id': events_df['id'].astype(str),
+        'title': events_df['title'],
+        'start': events_df['start_date'],
+        'end': np.datetime_as_string(end + np.timedelta64(1, 'D'), unit='D'),
+        'backgroundColor': color,
+        'borderColor': color,
+        'textColor': '#FFFFFF'
+    }).to_dict('records')
+
+def get_edit_queue():
+    # 세션/프로젝트별 드래그 변경 대기열 (이전/다음 달 버튼 콜백에서도 불리므로 세션의 프로젝트 기준)
+    project = session_project()
+    key = f'calendar_edits_{project}'
+    if key not in st.session_state:
+        st.session_state[key] = WriteQueue(project, flush_after=EDIT_FLUSH_SECONDS)
+    return st.session_state[key]
+
+def parse_changed_event(event):
+    # 컴포넌트가 돌려준 일정(FullCalendar event.toJSON())을 (id, 시작일, 종료일)로 변환
+    start = datetime.date.fromisoformat(event['start'][:10])
+    end = start
+    if event.get('end'):
+        end = datetime.date.fromisoformat(event['end'][:10])
+        if event.get('allDay', True):
+            end -= datetime.timedelta(days=1)
+        end = max(start, end)
+    return int(event['id']), start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+def queue_calendar_change(state):
+    # 드래그 이동/크기 조절(eventChange)을 대기열에 추가
+    # 컴포넌트는 마지막 값을 rerun마다 다시 돌려주므로 같은 값은 한 번만 처리
+    if not state or state.get('callback') != 'eventChange':
+        return
+    if state == st.session_state.get('calendar_last_change'):
+        return
+    st.session_state.calendar_last_change = state
+    event = state['eventChange']['event']
+    if event.get('id'):
+        get_edit_queue().put(*parse_changed_event(event))
+
+def apply_pending_edits(events, pending):
+    # 아직 저장하지 않은 변경을 화면용 일정 목록에 반영 (드래그한 위치가 되돌아가지 않도록)
+    for event in events:
+        change = pending.get(int(event['id']))
+        if change is not None:
+            event['start'] = change[0]
+            event['end'] = _next_day(change[1])
     return events
 
+def save_edits():
+    get_edit_queue().flush()
+
+def shift_month(year, month, delta):
+    index = year * 12 + month - 1 + delta
+    return index // 12, index % 12 + 1
+
+def month_grid_range(year, month):
+    # 해당 월 달력에 표시되는 첫날/마지막 날 (앞뒤 달의 날짜 포함)
+    first = datetime.date(year, month, 1)
+    grid_start = first - datetime.timedelta(days=(first.weekday() + 1) % 7)
+    return grid_start, grid_start + datetime.timedelta(days=GRID_DAYS - 1)
+
+def load_month_events(year, month):
+    # 화면에 보이는 기간과 겹치는 일정만 조회 (조회 캐시 사용)
+    return get_events_in_range(*month_grid_range(year, month))
+
+def prefetch_adjacent_months(year, month):
+    # 이전/다음 달로 이동할 때 바로 보이도록 백그라운드에서 캐시를 채움
+    for delta in range(-PREFETCH_MONTHS, PREFETCH_MONTHS + 1):
+        if delta:
+            prefetch(load_month_events, *shift_month(year, month, delta))
+
+def move_month(delta):
+    # 다른 달로 넘어가기 전에 대기 중인 변경을 저장
+    save_edits()
+    if delta == 0:
+        today = datetime.date.today()
+        st.session_state.calendar_month = (today.year, today.month)
+    else:
+        st.session_state.calendar_month = shift_month(*st.session_state.calendar_month, delta)
+
 def main():
+    project = select_project()
     st.title('📅 캘린더')
 
-    # DB 초기화
-    init_db()
+    # 표시할 달 (이동은 아래 버튼으로 하고, 해당 달의 일정만 컴포넌트에 전달)
+    if 'calendar_month' not in st.session_state:
+        move_month(0)
+    year, month = st.session_state.calendar_month
+
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 5])
+    col1.button("◀ 이전 달", on_click=move_month, args=(-1,), use_container_width=True)
+    col2.button("오늘", on_click=move_month, args=(0,), use_container_width=True)
+    col3.button("다음 달 ▶", on_click=move_month, args=(1,), use_container_width=True)
+
+    # 드래그 변경 처리 (컴포넌트 값은 렌더링 전에 세션에서 읽어 이번 화면에 바로 반영)
+    calendar_key = f"calendar_{project}_{year}_{month}"
+    queue_calendar_change(st.session_state.get(calendar_key))
+    edit_queue = get_edit_queue()
 
     # DB에서 이벤트 가져오기
-    events_df = get_all_events()
-    events = []
-    for _, row in events_df.iterrows():
-        events.append({
-            'title': row['title'],
-            'start': row['start_date'],
-            'end': row['end_date'],
-            'backgroundColor': row['color'],
-            'borderColor': row['color'],
-            'textColor': '#FFFFFF'
-        })
+    events_df = load_month_events(year, month)
+    with span('calendar.payload', rows=len(events_df)):
+        events = apply_pending_edits(build_calendar_events(events_df), edit_queue.pending())
+    prefetch_adjacent_months(year, month)
 
-    # 공휴일 이벤트 추가
+    # 공휴일 이벤트 추가 (보이는 기간만)
+    grid_start, grid_end = [day.strftime('%Y-%m-%d') for day in month_grid_range(year, month)]
     holiday_events = []
     for holiday in KOREAN_HOLIDAYS:
+        if not grid_start <= holiday['date'] <= grid_end:
+            continue
         holiday_events.append({
             'title': holiday['title'],
             'start': holiday['date'],
@@ -104,14 +182,20 @@ def main():
     # 모든 이벤트 합치기
     all_events = events + holiday_events
 
+    # 주/일 보기는 이번 달이면 오늘, 아니면 1일부터
+    today = datetime.date.today()
+    initial_date = today if (today.year, today.month) == (year, month) else datetime.date(year, month, 1)
+
     # 캘린더 옵션
     calendar_options = {
+        # 이전/다음 달 이동은 위의 버튼으로 처리 (컴포넌트가 보이는 기간 변경을 알려주지 않음)
         "headerToolbar": {
-            "left": "today prev,next",
+            "left": "",
             "center": "title",
             "right": "dayGridMonth,timeGridWeek,timeGridDay"
         },
         "initialView": "dayGridMonth",
+        "initialDate": initial_date.strftime("%Y-%m-%d"),
         "selectable": True,
         "editable": True,
         "locale": "ko",
@@ -242,7 +326,21 @@ def main():
     """, unsafe_allow_html=True)
 
     # 캘린더 표시
-    calendar(events=all_events, options=calendar_options, key="calendar")
+    with span('calendar.render', rows=len(all_events)):
+        calendar(
+            events=all_events,
+            options=calendar_options,
+            callbacks=["eventChange"],
+            key=calendar_key
+        )
+
+    # 저장 대기 중인 드래그 변경
+    pending_count = len(edit_queue)
+    if pending_count:
+        col1, col2, col3 = st.columns([3, 1, 1])
+        col1.info(f"저장 대기 중인 변경 {pending_count}건 ({EDIT_FLUSH_SECONDS}초 안에 자동 저장)")
+        col2.button("💾 지금 저장", on_click=save_edits, use_container_width=True)
+        col3.button("↩️ 취소", on_click=edit_queue.discard, use_container_width=True)
 
     # 새 일정 추가 폼
     st.divider()
@@ -276,11 +374,13 @@ def main():
                 )
                 st.success("✅ 일정이 추가되었습니다!")
                 st.balloons()
-                st.experimental_rerun()
+                st.rerun()
             else:
                 st.error("종료일이 시작일보다 빠를 수 없습니다!")
         else:
             st.error("일정 제목을 입력해주세요!")
 
 if __name__ == "__main__":
-    main()
+    with span('page.calendar'):
+        main()
+    show_debug_panel()
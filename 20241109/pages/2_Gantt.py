@@ -1,68 +1,129 @@
 # pages/2_gantt.py
 import streamlit as st
-import plotly.figure_factory as ff
-import pandas as pd
-import sqlite3
+from datetime import datetime
+from db import get_date_bounds, get_events_in_range
+from gantt import MODES, prepare_gantt_data, resolve_mode, build_gantt_figure, build_load_strip
+from conflicts import analyze_schedule
+from timing import span, show_debug_panel
+from projects import select_project
 
-def get_all_events():
-    conn = sqlite3.connect('calendar.db')
-    # SQL 쿼리 결과를 직접 DataFrame으로 변환
-    df = pd.read_sql_query("SELECT * FROM events", conn)
-    conn.close()
-    return df
+PAGE_SIZES = [25, 50, 100, 200]
 
 def main():
+    select_project()
     st.title('📊 Gantt Chart')
 
-    # DB에서 이벤트 가져오기
-    events_df = get_all_events()
+    first_date, last_date = get_date_bounds()
+    if first_date is None:
+        st.info("등록된 일정이 없습니다. 캘린더 페이지에서 일정을 추가해주세요.")
+        return
 
-    if len(events_df) > 0:  # DataFrame이 비어있지 않은지 확인
-        # 간트 차트용 데이터 준비
-        gantt_data = []
-        for _, row in events_df.iterrows():
-            gantt_data.append(dict(
-                Task=row['title'],
-                Start=pd.to_datetime(row['start_date']),
-                Finish=pd.to_datetime(row['end_date']),
-                Description=row['description'],
-                Resource=row['title']
-            ))
-        
-        # 간트 차트 생성
-        fig = ff.create_gantt(
-            gantt_data,
-            colors={row['title']: row['color'] for _, row in events_df.iterrows()},
-            index_col='Resource',
-            show_colorbar=True,
-            group_tasks=True,
-            showgrid_x=True,
-            showgrid_y=True
+    # 조회 기간 설정
+    col1, col2 = st.columns(2)
+    with col1:
+        window_start = st.date_input(
+            "시작일",
+            value=datetime.strptime(first_date, '%Y-%m-%d'),
+            key="gantt_start_date"
         )
-        
-        # 차트 레이아웃 설정
-        fig.update_layout(
-            title='Project Schedule',
-            xaxis_title='Date',
-            height=400 + (len(events_df) * 40),
-            font=dict(size=10)
+    with col2:
+        window_end = st.date_input(
+            "종료일",
+            value=datetime.strptime(last_date, '%Y-%m-%d'),
+            key="gantt_end_date"
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # 일정 목록 표시
+
+    # 기간과 겹치는 일정만 조회
+    events_df = get_events_in_range(window_start, window_end)
+
+    if len(events_df) > 0:  # DataFrame이 비어있지 않은지 확인
+        # 충돌(기간 겹침) / 일별 부하 분석
+        analysis = analyze_schedule(events_df)
+        highlight = st.checkbox("겹치는 일정 강조", value=True)
+
+        # 간트 차트용 데이터 준비
+        gantt_df = prepare_gantt_data(events_df, analysis['conflict_counts'] if highlight else None)
+
+        # 표시 방식 / 페이지 설정
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            mode = st.selectbox(
+                "표시 방식",
+                options=list(MODES),
+                format_func=lambda x: MODES[x]
+            )
+        mode = resolve_mode(len(gantt_df), mode)
+        with col2:
+            page_size = st.selectbox("페이지당 일정 수", options=PAGE_SIZES, index=1)
+        page_count = max((len(gantt_df) - 1) // page_size + 1, 1)
+        with col3:
+            page = st.number_input("페이지", min_value=1, max_value=page_count, value=1, step=1)
+        page_df = gantt_df.iloc[(page - 1) * page_size:page * page_size]
+
+        st.caption(f"{len(gantt_df):,}개 일정 · {MODES[mode]} 모드 · {page}/{page_count} 페이지")
+
+        # 간트 차트 생성 (막대 모드는 현재 페이지만, 나머지는 기간 전체를 그림)
+        fig = build_gantt_figure(page_df if mode == 'bar' else gantt_df, mode)
+        with span('gantt.render', mode=mode):
+            st.plotly_chart(fig, use_container_width=True)
+
+        # 일별 부하 띠 (최대 동시 진행일 표시)
+        load = analysis['load']
+        peak_count = int(load.max()) if len(load) else 0
+        if len(load):
+            st.plotly_chart(build_load_strip(load, threshold=peak_count), use_container_width=True)
+        if analysis['skipped']:
+            st.warning(f"종료일이 시작일보다 빠른 일정 {analysis['skipped']:,}건은 충돌/부하 분석에서 제외했습니다.")
+
+        with st.expander(f"⚠️ 일정 충돌 {analysis['total_pairs']:,}쌍", expanded=analysis['total_pairs'] > 0):
+            col1, col2, col3 = st.columns(3)
+            col1.metric("충돌 쌍", f"{analysis['total_pairs']:,}")
+            col2.metric("충돌 일정", f"{int((analysis['conflict_counts'] > 0).sum()):,}")
+            col3.metric(
+                "최대 동시 진행", f"{peak_count:,}건",
+                load.idxmax().strftime('%Y-%m-%d') if len(load) else None, delta_color="off"
+            )
+
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                pairs = analysis['pairs']
+                if len(pairs) < analysis['total_pairs']:
+                    st.caption(f"시작일순 앞 {len(pairs):,}쌍만 표시")
+                st.dataframe(
+                    pairs,
+                    column_config={
+                        'first_id': 'ID',
+                        'first_title': '일정',
+                        'second_id': 'ID',
+                        'second_title': '겹치는 일정',
+                        'overlap_start': '겹침 시작',
+                        'overlap_end': '겹침 종료'
+                    },
+                    hide_index=True
+                )
+            with col2:
+                st.dataframe(
+                    analysis['peak_days'].rename_axis('date').reset_index().assign(date=lambda df: df['date'].dt.strftime('%Y-%m-%d')),
+                    column_config={'date': '날짜', 'count': '진행 중 일정'},
+                    hide_index=True
+                )
+
+        # 일정 목록 표시 (현재 페이지)
         st.subheader("일정 목록")
         st.dataframe(
-            events_df[['title', 'start_date', 'end_date', 'description']],
+            page_df[['Task', 'StartDate', 'EndDate', 'Description']],
             column_config={
-                'title': '일정 제목',
-                'start_date': '시작일',
-                'end_date': '종료일',
-                'description': '설명'
-            }
+                'Task': '일정 제목',
+                'StartDate': '시작일',
+                'EndDate': '종료일',
+                'Description': '설명'
+            },
+            hide_index=True
         )
     else:
-        st.info("등록된 일정이 없습니다. 캘린더 페이지에서 일정을 추가해주세요.")
+        st.info("선택한 기간에 일정이 없습니다.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with span('page.gantt'):
+        main()
+    show_debug_panel()
@@ -1,8 +1,12 @@
 # pages/3_csv_import.py
 import streamlit as st
 import pandas as pd
-from db import add_event
-import io
+import numpy as np
+from db import add_events_bulk, upsert_events_bulk
+from export import map_colors
+from timing import span, show_debug_panel
+from projects import select_project
+import os
 
 # 색상 정의
 COLOR_MAPPING = {
@@ -13,12 +17,167 @@ COLOR_MAPPING = {
     "주황색": "#FF9671"
 }
 
+# 대량 업로드 설정
+REQUIRED_COLUMNS = ['title', 'start_date', 'end_date']
+CHUNK_SIZE = 10000      # 한 번에 읽어 들이는 행 수
+PREVIEW_ROWS = 100
+MAX_ERROR_ROWS = 200    # 오류 보고서에 보관할 최대 행 수
+
+# 가져오기 방식
+IMPORT_MODES = {
+    'append': '모두 새 일정으로 추가',
+    'upsert': '같은 일정은 갱신 (제목·시작일·종료일 기준, 다시 올려도 중복 없음)',
+}
+
+# 업로드 가능한 파일 형식 (확장자 → 표시 이름)
+UPLOAD_FORMATS = {
+    'csv': 'CSV',
+    'parquet': 'Parquet',
+    'arrow': 'Arrow IPC',
+    'feather': 'Arrow IPC',
+}
+
+def file_format(uploaded_file):
+    return os.path.splitext(uploaded_file.name)[1].lstrip('.').lower()
+
+def _parse_dates(column):
+    # 문자열은 'YYYY-MM-DD' 형식만 허용, 날짜/시각 타입(Parquet/Arrow의 timestamp/date 포함)은 그대로 변환
+    # 그 밖의 타입(CSV에서 정수로 읽힌 20241101 등)은 모두 형식 오류
+    if column.dtype.kind == 'M':
+        return pd.to_datetime(column, errors='coerce')
+    if pd.api.types.is_string_dtype(column) or column.dtype == object:
+        return pd.to_datetime(column, format='%Y-%m-%d', errors='coerce')
+    return pd.Series(pd.NaT, index=column.index, dtype='datetime64[ns]')
+
+def read_chunks(uploaded_file, chunk_size=CHUNK_SIZE):
+    # 파일을 chunk_size 행씩 읽어 (DataFrame, 진행률) 전달
+    # Parquet/Arrow는 Arrow 배열을 그대로 쓰는 DataFrame(pd.ArrowDtype)으로 읽어 행마다 객체를 만들지 않음
+    # 인덱스는 파일 전체 기준 행 위치 (오류 보고서의 행 번호에 사용)
+    # pyarrow는 Parquet/Arrow 파일을 올렸을 때만 import
+    fmt = file_format(uploaded_file)
+    if fmt == 'csv':
+        total_size = max(uploaded_file.size, 1)
+        for chunk in pd.read_csv(uploaded_file, chunksize=chunk_size):
+            yield chunk, min(uploaded_file.tell() / total_size, 1.0)
+        return
+    
+    import pyarrow as pa
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(uploaded_file)
+        total_rows = parquet.metadata.num_rows
+        batches = parquet.iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(uploaded_file)
+        total_rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+        batches = (
+            batch.slice(offset, chunk_size)
+            for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+            for offset in range(0, batch.num_rows, chunk_size)
+        )
+    offset = 0
+    for batch in batches:
+        chunk = batch.to_pandas(types_mapper=pd.ArrowDtype)
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk, offset / max(total_rows, 1)
+
+def validate_chunk(chunk, first_row=2):
+    # 청크 단위 벡터 검증 → (등록할 일정 DataFrame, 오류 DataFrame)
+    # first_row: 파일의 첫 데이터 행이 오류 보고서에 표시될 행 번호 (CSV는 헤더 행 다음이라 2)
+    title = chunk['title']
+    start = _parse_dates(chunk['start_date'])
+    end = _parse_dates(chunk['end_date'])
+    
+    # 행마다 첫 번째로 걸린 오류 사유만 기록
+    checks = [
+        (title.isna() | (title.astype(str).str.strip() == ''), '제목 없음'),
+        (start.isna(), '시작일 형식 오류'),
+        (end.isna(), '종료일 형식 오류'),
+        (start > end, '종료일이 시작일보다 빠름'),
+    ]
+    reasons = np.select([mask for mask, _ in checks], [reason for _, reason in checks], default='')
+    invalid = reasons != ''
+    valid = ~invalid
+    
+    errors_df = pd.DataFrame({
+        '행 번호': chunk.index[invalid] + first_row,
+        'title': title[invalid],
+        '사유': reasons[invalid]
+    })
+    
+    # 색상 변환 (매핑에 없는 색상명은 기본 색상(빨간색) 사용)
+    if 'color' in chunk.columns:
+        color = map_colors(chunk['color'][valid], COLOR_MAPPING, COLOR_MAPPING['빨간색'])
+    else:
+        color = COLOR_MAPPING['빨간색']
+    
+    if 'description' in chunk.columns:
+        description = chunk['description'][valid].fillna('').astype(str)
+    else:
+        description = ''
+    
+    valid_df = pd.DataFrame({
+        'title': title[valid].astype(str),
+        'start_date': start[valid].dt.strftime('%Y-%m-%d'),
+        'end_date': end[valid].dt.strftime('%Y-%m-%d'),
+        'color': color,
+        'description': description
+    })
+    return valid_df, errors_df
+
+def import_events(uploaded_file, mode='append'):
+    # 파일을 CHUNK_SIZE 행씩 읽어 검증 후 일괄 등록 (메모리 사용량 일정)
+    # mode='upsert'면 이미 있는 일정은 새로 만들지 않고 갱신/건너뜀
+    # 반환: ({'inserted', 'updated', 'skipped'} 건수, 오류 DataFrame(최대 MAX_ERROR_ROWS행), 사유별 오류 건수)
+    error_counts = pd.Series(dtype='int64')
+    error_frames = []
+    progress = st.progress(0.0, text="일정 등록 중...")
+    
+    def valid_rows():
+        nonlocal error_counts
+        processed = 0
+        # Parquet/Arrow 파일에는 헤더 행이 없음
+        first_row = 2 if file_format(uploaded_file) == 'csv' else 1
+        for chunk, fraction in read_chunks(uploaded_file):
+            valid_df, errors_df = validate_chunk(chunk, first_row)
+            
+            error_counts = error_counts.add(errors_df['사유'].value_counts(), fill_value=0)
+            kept = sum(len(df) for df in error_frames)
+            if kept < MAX_ERROR_ROWS and not errors_df.empty:
+                error_frames.append(errors_df.head(MAX_ERROR_ROWS - kept))
+            
+            yield from valid_df.itertuples(index=False, name=None)
+            processed += len(valid_df)
+            progress.progress(fraction, text=f"{processed:,}건 처리 중...")
+        if mode == 'upsert':
+            progress.progress(1.0, text="기존 일정과 비교해 저장하는 중...")
+    
+    if mode == 'upsert':
+        result = upsert_events_bulk(valid_rows())
+    else:
+        result = {'inserted': add_events_bulk(valid_rows()), 'updated': 0, 'skipped': 0}
+    
+    progress.empty()
+    errors_df = pd.concat(error_frames, ignore_index=True) if error_frames else pd.DataFrame()
+    return result, errors_df, error_counts.astype('int64')
+
+def show_error_report(errors_df, error_counts):
+    # 실패한 행을 사유별로 요약해서 한 번에 표시
+    st.warning(
+        f"{error_counts.sum():,}개 행을 등록하지 못했습니다. "
+        + ", ".join(f"{reason} {count:,}건" for reason, count in error_counts.items())
+    )
+    with st.expander(f"실패한 행 보기 (최대 {MAX_ERROR_ROWS}행)"):
+        st.dataframe(errors_df, hide_index=True, use_container_width=True)
+
 def main():
+    select_project()
     st.title("📤 CSV 일정 업로드")
     
     # CSV 파일 형식 안내
     st.info("""
-    CSV 파일 형식 안내:
+    CSV / Parquet / Arrow IPC(.arrow, .feather) 파일 형식 안내:
     - 필수 컬럼: title(일정제목), start_date(시작일), end_date(종료일)
     - 선택 컬럼: color(색상), description(설명)
     - 날짜 형식: YYYY-MM-DD (예: 2024-11-10)
@@ -46,54 +205,54 @@ def main():
     )
     
     # CSV 파일 업로드
-    uploaded_file = st.file_uploader("CSV 파일 선택", type=['csv'])
+    uploaded_file = st.file_uploader("CSV 파일 선택", type=list(UPLOAD_FORMATS))
     
     if uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            # 미리보기는 앞부분만 읽음
+            preview_df, _ = next(read_chunks(uploaded_file, PREVIEW_ROWS))
+            uploaded_file.seek(0)
             
             # 필수 컬럼 확인
-            required_columns = ['title', 'start_date', 'end_date']
-            if not all(col in df.columns for col in required_columns):
+            if not all(col in preview_df.columns for col in REQUIRED_COLUMNS):
                 st.error("필수 컬럼이 없습니다. title, start_date, end_date 컬럼이 필요합니다.")
                 return
             
-            # 색상 변환
-            if 'color' in df.columns:
-                # 색상명이 매핑에 없는 경우 기본 색상(빨간색) 사용
-                df['color'] = df['color'].apply(lambda x: COLOR_MAPPING.get(x, COLOR_MAPPING['빨간색']))
-            else:
-                df['color'] = COLOR_MAPPING['빨간색']
-            
             # 데이터 미리보기
             st.subheader("데이터 미리보기")
-            preview_df = df.copy()
             if 'color' in preview_df.columns:
-                # 미리보기에서는 다시 색상 이름으로 변환
-                reverse_color_mapping = {v: k for k, v in COLOR_MAPPING.items()}
-                preview_df['color'] = preview_df['color'].map(reverse_color_mapping)
+                # 색상명이 매핑에 없는 경우 기본 색상(빨간색)으로 표시
+                preview_df['color'] = preview_df['color'].where(
+                    preview_df['color'].isin(list(COLOR_MAPPING)), '빨간색'
+                )
+            st.caption(f"앞 {PREVIEW_ROWS}행까지만 표시합니다.")
             st.dataframe(preview_df)
             
+            mode = st.radio(
+                "가져오기 방식",
+                options=list(IMPORT_MODES),
+                format_func=lambda x: IMPORT_MODES[x]
+            )
+            
             # 업로드 확인
             if st.button("일정 등록하기"):
-                success_count = 0
-                for _, row in df.iterrows():
-                    try:
-                        add_event(
-                            title=row['title'],
-                            start_date=row['start_date'],
-                            end_date=row['end_date'],
-                            color=row['color'],
-                            description=row.get('description', '')
-                        )
-                        success_count += 1
-                    except Exception as e:
-                        st.error(f"일정 '{row['title']}' 등록 실패: {str(e)}")
+                uploaded_file.seek(0)
+                result, errors_df, error_counts = import_events(uploaded_file, mode)
                 
-                st.success(f"총 {success_count}개의 일정이 등록되었습니다.")
+                if mode == 'upsert':
+                    st.success(
+                        f"새 일정 {result['inserted']:,}개 추가, {result['updated']:,}개 갱신, "
+                        f"변경 없는 {result['skipped']:,}개는 건너뛰었습니다."
+                    )
+                else:
+                    st.success(f"총 {result['inserted']}개의 일정이 등록되었습니다.")
+                if not errors_df.empty:
+                    show_error_report(errors_df, error_counts)
                 
         except Exception as e:
-            st.error(f"CSV 파일 처리 중 오류가 발생했습니다: {str(e)}")
+            st.error(f"{UPLOAD_FORMATS[file_format(uploaded_file)]} 파일 처리 중 오류가 발생했습니다: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with span('page.csv_import'):
+        main()
+    show_debug_panel()
\ No newline at end of file
@@ -1,139 +1,144 @@
 # pages/4_event_management.py
 import streamlit as st
-import pandas as pd
-from db import get_all_events, delete_all_events
-import sqlite3
+from db import (
+    current_project, get_date_bounds, get_events_by_ids, get_pool,
+    search_events, query_events, delete_events, PAGE_SIZE
+)
+from interval_index import get_interval_index
+from calendar_image import (
+    RENDERERS, create_calendar_image, get_month_events,
+    render_month_png, render_year_zip
+)
+from export import FORMATS, export_to_bytes
+from timing import span, show_debug_panel
+from projects import select_project, in_session_project
 from datetime import datetime
-import calendar
-import io
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import time 
 
 
-COLOR_MAPPING = {
-    "#FF6B6B": "빨간색",
-    "#45B7D1": "파란색",
-    "#4ECDC4": "초록색",
-    "#845EC2": "보라색",
-    "#FF9671": "주황색"
+# 일정 목록 표시 컬럼
+EVENT_COLUMNS = {
+    'title': '일정 제목',
+    'start_date': '시작일',
+    'end_date': '종료일',
+    'description': '설명'
 }
 
-def convert_color_to_name(color_code):
-    return COLOR_MAPPING.get(color_code, "빨간색")  # 기본값은 빨간색
+# 조회 조건 중 일괄 삭제에 쓰는 항목
+FILTER_KEYS = ('start', 'end', 'keyword')
 
+def show_events_table(df, key=None):
+    # key를 주면 여러 행을 선택할 수 있고, 선택한 행의 위치 목록을 반환
+    if key is None:
+        st.dataframe(
+            df[list(EVENT_COLUMNS)],
+            column_config=EVENT_COLUMNS,
+            hide_index=True,
+            use_container_width=True
+        )
+        return []
+    selection = st.dataframe(
+        df[list(EVENT_COLUMNS)],
+        column_config=EVENT_COLUMNS,
+        hide_index=True,
+        use_container_width=True,
+        key=key,
+        on_select="rerun",
+        selection_mode="multi-row"
+    )
+    return selection.selection.rows
 
-def create_calendar_image(events_df, year, month):
-    # 달력 데이터 준비
-    cal = calendar.monthcalendar(year, month)
-    
-    # Plotly figure 생성
-    fig = go.Figure()
+@in_session_project
+def delete_and_report(key, **conditions):
+    # 일괄 삭제 후 결과 메시지를 남기고, 표의 선택 상태를 초기화(표 key 변경)
+    deleted = delete_events(**conditions)
+    st.session_state[f"{key}_message"] = f"✅ {deleted:,}건을 삭제했습니다."
+    st.session_state[f"{key}_table"] = st.session_state.get(f"{key}_table", 0) + 1
+    st.session_state[f"{key}_cursors"] = [None]
+
+def show_paged_events(key, title, empty_message, **query):
+    # 현재 페이지만 DB에서 조회해서 표시 (키셋 페이지네이션)
+    # 방문한 페이지들의 시작 커서를 세션에 쌓아 두고 이전/다음으로 이동
+    cursors_key = f"{key}_cursors"
+    query_key = f"{key}_query"
     
-    # 테이블 데이터 준비
-    table_data = []
-    colors = []
+    # 조회 조건이나 프로젝트가 바뀌면 첫 페이지부터
+    scope = (current_project(), query)
+    if st.session_state.get(query_key) != scope:
+        st.session_state[query_key] = scope
+        st.session_state[cursors_key] = [None]
+    cursors = st.session_state[cursors_key]
     
-    # 요일 헤더
-    weekdays = ['일', '월', '화', '수', '목', '금', '토']
-    table_data.append(weekdays)
-    colors.append(['rgb(255,0,0)' if d == '일' else 'rgb(0,0,255)' if d == '토' else 'black' for d in weekdays])
+    page_df, total, next_cursor = query_events(after=cursors[-1], page_size=PAGE_SIZE, **query)
     
-    # 달력 데이터와 이벤트 매핑
-    for week in cal:
-        week_data = []
-        week_colors = []
-        for i, day in enumerate(week):
-            if day == 0:
-                cell_content = ""
-                cell_color = 'white'
-            else:
-                date_str = f"{year}-{month:02d}-{day:02d}"
-                day_events = events_df[
-                    (pd.to_datetime(events_df['start_date']) <= date_str) &
-                    (pd.to_datetime(events_df['end_date']) >= date_str)
-                ]
-                
-                # 날짜와 이벤트 텍스트 결합
-                cell_content = f"{day}\n"
-                if not day_events.empty:
-                    events_text = "\n".join([f"• {row['title']}" for _, row in day_events.iterrows()])
-                    cell_content += events_text
-                
-                # 주말 색상 설정
-                cell_color = 'rgb(255,0,0)' if i == 0 else 'rgb(0,0,255)' if i == 6 else 'black'
-            
-            week_data.append(cell_content)
-            week_colors.append(cell_color)
-        
-        table_data.append(week_data)
-        colors.append(week_colors)
+    st.subheader(f"{title} ({total:,}건)")
+    message = st.session_state.pop(f"{key}_message", None)
+    if message:
+        st.success(message)
+    if page_df.empty:
+        st.info(empty_message)
+        return
     
-    # Plotly 테이블 생성
-    fig.add_trace(
-        go.Table(
-            header=dict(
-                values=[f'<b>{day}</b>' for day in weekdays],
-                line_color='white',
-                fill_color='lightgrey',
-                align='center',
-                font=dict(size=14, color=colors[0])
-            ),
-            cells=dict(
-                values=[[row[i] for row in table_data[1:]] for i in range(7)],
-                line_color='white',
-                fill_color='white',
-                align='center',
-                height=80,
-                font=dict(size=12),
-                font_color=[[colors[i+1][j] for i in range(len(table_data)-1)] for j in range(7)]
-            )
+    # 여러 행을 선택해서 한 번에 삭제
+    selected = show_events_table(page_df, key=f"{key}_table_{st.session_state.get(f'{key}_table', 0)}")
+    if selected:
+        selected_ids = [int(event_id) for event_id in page_df['id'].iloc[selected]]
+        st.button(
+            f"🗑️ 선택한 {len(selected_ids)}건 삭제",
+            key=f"{key}_delete_selected",
+            on_click=delete_and_report,
+            args=(key,),
+            kwargs={'ids': selected_ids}
         )
-    )
     
-    # 레이아웃 설정
-    fig.update_layout(
-        title=dict(
-            text=f'{year}년 {month}월',
-            x=0.5,
-            font=dict(size=24)
-        ),
-        width=800,
-        height=600,
-        margin=dict(l=20, r=20, t=60, b=20)
-    )
+    # 조건이 있는 조회(검색)는 결과 전체를 한 번에 삭제할 수 있음
+    filters = {name: query[name] for name in FILTER_KEYS if query.get(name) is not None}
+    if filters:
+        with st.expander(f"검색 결과 {total:,}건 모두 삭제"):
+            confirmed = st.checkbox("되돌릴 수 없음을 확인했습니다.", key=f"{key}_delete_confirm")
+            st.button(
+                "검색 결과 전체 삭제",
+                key=f"{key}_delete_all",
+                disabled=not confirmed,
+                on_click=delete_and_report,
+                args=(key,),
+                kwargs=filters
+            )
     
-    return fig
+    page_count = max((total - 1) // PAGE_SIZE + 1, 1)
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("◀ 이전", key=f"{key}_prev", disabled=len(cursors) == 1, on_click=cursors.pop)
+    with col2:
+        st.caption(f"{len(cursors)} / {page_count} 페이지")
+    with col3:
+        st.button(
+            "다음 ▶",
+            key=f"{key}_next",
+            disabled=next_cursor is None,
+            on_click=cursors.append,
+            args=(next_cursor,)
+        )
+
 
 def main():
+    project = select_project()
     st.title("📋 일정 관리")
     
-    # 데이터 가져오기
-    events_df = get_all_events()
+    # 전체 일정의 기간 (일정이 없으면 None)
+    first_date, last_date = get_date_bounds()
     
     # 탭 생성
     tab1, tab2, tab3 = st.tabs(["📋 전체 조회","🔍고급검색", "📥 다운로드"])
     
     with tab1:
-        st.subheader("전체 일정 목록")
-        if not events_df.empty:
-            # 날짜순으로 정렬
-            events_df_sorted = events_df.sort_values('start_date', ascending=False)
-            
-            # 데이터프레임 표시
-            st.dataframe(
-                events_df_sorted[['title', 'start_date', 'end_date', 'description']],
-                column_config={
-                    'title': '일정 제목',
-                    'start_date': '시작일',
-                    'end_date': '종료일',
-                    'description': '설명'
-                },
-                hide_index=True,
-                use_container_width=True
-            )
-        else:
-            st.info("등록된 일정이 없습니다.")
+        # 시작일 내림차순으로 한 페이지씩 표시
+        show_paged_events(
+            "all",
+            "전체 일정 목록",
+            "등록된 일정이 없습니다.",
+            sort_by="start_date",
+            ascending=False
+        )
     with tab2:
         st.subheader("고급 조회")
         
@@ -143,14 +148,14 @@ def main():
         with col1:
             start_date = st.date_input(
                 "시작일",
-                value=datetime.strptime(events_df['start_date'].min(), '%Y-%m-%d') if not events_df.empty else datetime.now(),
+                value=datetime.strptime(first_date, '%Y-%m-%d') if first_date else datetime.now(),
                 key="search_start_date"
             )
         
         with col2:
             end_date = st.date_input(
                 "종료일",
-                value=datetime.strptime(events_df['end_date'].max(), '%Y-%m-%d') if not events_df.empty else datetime.now(),
+                value=datetime.strptime(last_date, '%Y-%m-%d') if last_date else datetime.now(),
                 key="search_end_date"
             )
         
@@ -163,11 +168,12 @@ def main():
             with col1:
                 sort_by = st.selectbox(
                     "정렬 기준",
-                    options=["시작일", "종료일", "제목"],
+                    options=["시작일", "종료일", "제목", "관련도"],
                     format_func=lambda x: {
                         "시작일": "시작일",
                         "종료일": "종료일",
-                        "제목": "제목"
+                        "제목": "제목",
+                        "관련도": "관련도 (검색어 입력 시)"
                     }[x]
                 )
             
@@ -178,51 +184,43 @@ def main():
                 )
         
         # 검색 실행
-        if not events_df.empty:
-            # 날짜 필터링
-            mask = pd.to_datetime(events_df['start_date']) >= pd.to_datetime(start_date)
-            mask &= pd.to_datetime(events_df['end_date']) <= pd.to_datetime(end_date)
-            
-            # 키워드 필터링
-            if keyword:
-                keyword_lower = keyword.lower()
-                mask &= (
-                    events_df['title'].str.lower().str.contains(keyword_lower, na=False) |
-                    events_df['description'].str.lower().str.contains(keyword_lower, na=False)
+        if first_date is not None:
+            if sort_by == "관련도" and keyword:
+                # 관련도순은 전문 검색 결과 상위 한 페이지만 표시
+                filtered_df = search_events(keyword, start_date, end_date, limit=PAGE_SIZE)
+                st.subheader(f"검색 결과 (관련도 상위 {len(filtered_df)}건)")
+                if not filtered_df.empty:
+                    show_events_table(filtered_df)
+                else:
+                    st.info("검색 조건에 맞는 일정이 없습니다.")
+            else:
+                # 날짜/키워드 필터, 정렬, 페이지 나누기를 모두 DB에서 처리
+                sort_column = {
+                    "시작일": "start_date",
+                    "종료일": "end_date",
+                    "제목": "title",
+                    "관련도": "start_date"
+                }[sort_by]
+                show_paged_events(
+                    "search",
+                    "검색 결과",
+                    "검색 조건에 맞는 일정이 없습니다.",
+                    start=start_date,
+                    end=end_date,
+                    keyword=keyword or None,
+                    sort_by=sort_column,
+                    ascending=(sort_order == "오름차순")
                 )
             
-            filtered_df = events_df[mask]
-            
-            # 정렬
-            sort_column = {
-                "시작일": "start_date",
-                "종료일": "end_date",
-                "제목": "title"
-            }[sort_by]
-            
-            filtered_df = filtered_df.sort_values(
-                sort_column,
-                ascending=(sort_order == "오름차순")
-            )
-            
-            # 결과 표시
-            st.subheader(f"검색 결과 ({len(filtered_df)}건)")
-            
-            if not filtered_df.empty:
-                # 검색 결과 테이블
-                st.dataframe(
-                    filtered_df[['title', 'start_date', 'end_date', 'description']],
-                    column_config={
-                        'title': '일정 제목',
-                        'start_date': '시작일',
-                        'end_date': '종료일',
-                        'description': '설명'
-                    },
-                    hide_index=True,
-                    use_container_width=True
-                )
+            # 특정 날짜에 진행 중인 일정 (기간 인덱스로 조회)
+            st.divider()
+            on_date = st.date_input("📍 이 날짜에 진행 중인 일정", value=datetime.now(), key="on_date")
+            ongoing_ids = get_interval_index().at(on_date)
+            if len(ongoing_ids):
+                st.caption(f"{len(ongoing_ids)}건" + (f" 중 앞 {PAGE_SIZE}건 표시" if len(ongoing_ids) > PAGE_SIZE else ""))
+                show_events_table(get_events_by_ids(ongoing_ids[:PAGE_SIZE]))
             else:
-                st.info("검색 조건에 맞는 일정이 없습니다.")
+                st.info("이 날짜에 진행 중인 일정이 없습니다.")
         else:
             st.info("등록된 일정이 없습니다.")
 
@@ -230,48 +228,61 @@ def main():
     with tab3:
         st.subheader("데이터 다운로드")
         
-        if not events_df.empty:
-            # 데이터프레임에 색상 이름 컬럼 추가
-            export_df = events_df.copy()
-            export_df['color'] = export_df['color'].apply(convert_color_to_name)
-            
+        if first_date is not None:
+            # 내보내기 조건
             col1, col2 = st.columns(2)
-            
             with col1:
-                # 엑셀 다운로드
-                excel_buffer = io.BytesIO()
-                with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                    # export_df의 컬럼 순서와 이름을 원하는 형식으로 변경
-                    export_df = export_df[['title', 'start_date', 'end_date', 'color', 'description']]
-                    export_df.columns = ['title', 'start_date', 'end_date', 'color', 'description']
-                    export_df.to_excel(
-                        writer, 
-                        index=False, 
-                        sheet_name='Events'
-                    )
-                
-                st.download_button(
-                    label="📥 엑셀 다운로드",
-                    data=excel_buffer.getvalue(),
-                    file_name="events.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                export_start = st.date_input(
+                    "시작일",
+                    value=datetime.strptime(first_date, '%Y-%m-%d'),
+                    key="export_start_date"
+                )
+            with col2:
+                export_end = st.date_input(
+                    "종료일",
+                    value=datetime.strptime(last_date, '%Y-%m-%d'),
+                    key="export_end_date"
                 )
             
+            col1, col2 = st.columns(2)
+            with col1:
+                export_keyword = st.text_input(
+                    "검색어 (제목 또는 설명에 포함)",
+                    placeholder="비워두면 전체",
+                    key="export_keyword"
+                )
             with col2:
-                # CSV 다운로드
-                csv_buffer = io.StringIO()
-                export_df.to_csv(
-                    csv_buffer, 
-                    index=False, 
-                    encoding='utf-8-sig'
+                export_format = st.selectbox(
+                    "파일 형식",
+                    options=list(FORMATS),
+                    format_func=lambda x: FORMATS[x]['label']
                 )
-                
+            
+            # 버튼을 누를 때만 DB에서 청크 단위로 읽어 파일을 만들고, 내용은 세션에만 보관 (임시 파일은 바로 삭제)
+            # 프로젝트를 바꾸면 이전 프로젝트의 파일이 보이지 않도록 프로젝트별 키 사용
+            export_key = f'export_file_{project}'
+            if st.button("📦 내보내기 파일 만들기"):
+                with st.spinner("파일 생성 중..."):
+                    data, count = export_to_bytes(
+                        export_format,
+                        start=export_start,
+                        end=export_end,
+                        keyword=export_keyword or None
+                    )
+                st.session_state[export_key] = {'data': data, 'format': export_format, 'count': count}
+            
+            export_file = st.session_state.get(export_key)
+            if export_file:
+                file_format = FORMATS[export_file['format']]
+                st.caption(f"{export_file['count']:,}개 일정")
                 st.download_button(
-                    label="📥 CSV 다운로드",
-                    data=csv_buffer.getvalue().encode('utf-8-sig'),
-                    file_name="events.csv",
-                    mime="text/csv"
+                    label=f"📥 {file_format['label']} 다운로드",
+                    data=export_file['data'],
+                    file_name=file_format['file_name'],
+                    mime=file_format['mime']
                 )
+        else:
+            st.info("등록된 일정이 없습니다.")
         
         st.divider()
         
@@ -287,21 +298,52 @@ def main():
                                range(1, 13),
                                index=datetime.now().month - 1)
         
-        if not events_df.empty:
-            # 캘린더 생성 및 표시
-            fig = create_calendar_image(events_df, year, month)
+        if first_date is not None:
+            # 캘린더 생성 및 표시 (해당 월과 겹치는 일정만 조회)
+            fig = create_calendar_image(get_month_events(year, month), year, month)
             st.plotly_chart(fig, use_container_width=True)
             
-            # 이미지 다운로드 버튼
-            img_bytes = fig.to_image(format="png", width=800, height=600, scale=2)
-            st.download_button(
-                label="📥 캘린더 이미지 다운로드",
-                data=img_bytes,
-                file_name=f"calendar_{year}_{month:02d}.png",
-                mime="image/png"
+            renderer = st.radio(
+                "이미지 렌더러",
+                options=list(RENDERERS),
+                format_func=lambda x: RENDERERS[x],
+                horizontal=True
             )
+            
+            # 이미지는 버튼을 눌렀을 때만 렌더링하고 결과는 세션에 보관
+            # 프로젝트/데이터 버전/조건이 같을 때만 다운로드 버튼을 보여 줌 (다른 rerun에서는 다시 렌더링하지 않음)
+            version = get_pool().data_version()
+            col1, col2 = st.columns(2)
+            with col1:
+                image_key = (project, version, year, month, renderer)
+                if st.button("🖼️ 월간 이미지 만들기"):
+                    with st.spinner("이미지 생성 중..."):
+                        st.session_state['calendar_image'] = (image_key, render_month_png(year, month, renderer))
+                image = st.session_state.get('calendar_image')
+                if image and image[0] == image_key:
+                    st.download_button(
+                        label="📥 캘린더 이미지 다운로드",
+                        data=image[1],
+                        file_name=f"calendar_{year}_{month:02d}.png",
+                        mime="image/png"
+                    )
+            with col2:
+                zip_key = (project, version, year, renderer)
+                if st.button("🗂️ 연간 이미지 만들기"):
+                    with st.spinner(f"{year}년 12개월 이미지 생성 중..."):
+                        st.session_state['calendar_year_zip'] = (zip_key, render_year_zip(year, renderer))
+                year_zip = st.session_state.get('calendar_year_zip')
+                if year_zip and year_zip[0] == zip_key:
+                    st.download_button(
+                        label=f"📥 {year}년 전체 다운로드 (ZIP)",
+                        data=year_zip[1],
+                        file_name=f"calendar_{year}.zip",
+                        mime="application/zip"
+                    )
         else:
             st.info("표시할 일정이 없습니다.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with span('page.event_management'):
+        main()
+    show_debug_panel()
\ No newline at end of file
@@ -0,0 +1,43 @@
+# projects.py
+# 프로젝트 선택 (모든 페이지의 사이드바)
+# 선택한 프로젝트는 세션에 보관하고, 페이지를 실행할 때마다 db.use_project로 지정해서
+# 이후의 조회/쓰기가 모두 해당 프로젝트의 데이터베이스 파일로 가도록 함
+import functools
+import streamlit as st
+from db import DEFAULT_PROJECT, list_projects, project_scope, use_project
+
+SESSION_KEY = 'project'
+
+def session_project():
+    # 이 세션에서 선택한 프로젝트 (선택한 적이 없거나 파일이 없어졌으면 기본 프로젝트)
+    name = st.session_state.get(SESSION_KEY, DEFAULT_PROJECT)
+    return name if name in list_projects() else DEFAULT_PROJECT
+
+def set_session_project(name):
+    st.session_state[SESSION_KEY] = name
+
+def _on_select():
+    set_session_project(st.session_state[f'{SESSION_KEY}_select'])
+
+def select_project():
+    # 사이드바에 선택 상자를 그리고 현재 프로젝트를 지정한 뒤 이름을 반환 (페이지 main 맨 앞에서 호출)
+    # 위젯 값은 다른 페이지로 옮기면 사라지므로 선택 결과는 별도 세션 키에 보관
+    projects = list_projects()
+    current = session_project()
+    st.sidebar.selectbox(
+        "📁 프로젝트",
+        options=projects,
+        index=projects.index(current),
+        key=f'{SESSION_KEY}_select',
+        on_change=_on_select
+    )
+    use_project(current)
+    return current
+
+def in_session_project(callback):
+    # 위젯 콜백은 페이지 스크립트보다 먼저 실행되므로 세션의 프로젝트를 직접 지정해서 실행
+    @functools.wraps(callback)
+    def wrapper(*args, **kwargs):
+        with project_scope(session_project()):
+            return callback(*args, **kwargs)
+    return wrapper
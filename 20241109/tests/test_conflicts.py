@@ -0,0 +1,35 @@
+# tests/test_conflicts.py
+# 종료일이 시작일보다 빠른 일정이 섞여 있어도 충돌/부하 분석이 실패하지 않고 해당 일정만 빼는지 확인
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sys
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conflicts import analyze_schedule
+
+def test_inverted_intervals_are_skipped():
+    events_df = pd.DataFrame({
+        'id': [1, 2, 3, 4],
+        'title': ['가', '뒤집힘', '나', '다'],
+        'start_date': ['2024-11-01', '2024-11-10', '2024-11-02', '2024-11-20'],
+        'end_date': ['2024-11-03', '2024-11-05', '2024-11-04', '2024-11-20'],
+    })
+    analysis = analyze_schedule(events_df)
+    assert analysis['skipped'] == 1
+    assert analysis['total_pairs'] == 1
+    assert analysis['pairs'][['first_id', 'second_id']].values.tolist() == [[1, 3]]
+    assert analysis['conflict_counts'].tolist() == [1, 0, 1, 0]
+    assert analysis['load'].min() >= 0
+    assert analysis['load'].sum() == 3 + 3 + 1
+
+def test_only_inverted_intervals():
+    events_df = pd.DataFrame({
+        'id': [1], 'title': ['뒤집힘'], 'start_date': ['2024-11-10'], 'end_date': ['2024-11-05'],
+    })
+    analysis = analyze_schedule(events_df)
+    assert analysis['skipped'] == 1
+    assert analysis['total_pairs'] == 0
+    assert analysis['load'].empty
+    assert analysis['conflict_counts'].tolist() == [0]
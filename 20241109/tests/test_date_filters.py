@@ -0,0 +1,35 @@
+# tests/test_date_filters.py
+# 기간 조회/검색에서 시작일/종료일 중 하나 또는 둘 다 생략해도 올바른 SQL이 만들어지는지 확인
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    db.init_db()
+    db.add_event('회의 준비', '2024-11-01', '2024-11-02', '#45B7D1', '자료')
+    db.add_event('회의', '2024-11-10', '2024-11-12', '#45B7D1', '본회의')
+    yield
+    db.close_all_connections()
+
+@pytest.mark.parametrize('start, end, expected', [
+    (None, None, ['회의 준비', '회의']),
+    ('2024-11-05', None, ['회의']),
+    (None, '2024-11-05', ['회의 준비']),
+    ('2024-11-01', '2024-11-30', ['회의 준비', '회의']),
+])
+def test_optional_bounds(database, start, end, expected):
+    assert db.get_events_in_range(start, end)['title'].tolist() == expected
+    # 3글자 이상은 FTS, 2글자 이하는 LIKE 경로
+    assert sorted(db.search_events('회의 준', start, end)['title']) == sorted(set(expected) & {'회의 준비'})
+    assert sorted(db.search_events('회의', start, end)['title']) == sorted(expected)
+
+def test_date_bounds_skip_unparseable_dates(database):
+    db.add_event('예전 형식', '2024/10/01', '2024/12/31', '#45B7D1')
+    assert tuple(db.get_date_bounds()) == ('2024-11-01', '2024-11-12')
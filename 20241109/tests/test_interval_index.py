@@ -0,0 +1,86 @@
+# tests/test_interval_index.py
+# 공유 기간 인덱스가 알림 없는 쓰기(일괄 등록 등)와 단건 쓰기가 섞여도 DB와 같은지 확인
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sys
+import threading
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+from interval_index import get_interval_index
+
+DAYS = [f'2024-11-{day:02d}' for day in range(1, 31)]
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    db.init_db()
+    yield
+    db.close_all_connections()
+
+def bulk_rows(count, prefix='일괄'):
+    return [
+        (f'{prefix} {i}', DAYS[i % 20], DAYS[i % 20 + i % 7], '#FF6B6B', '')
+        for i in range(count)
+    ]
+
+def assert_index_matches_db():
+    index = get_interval_index()
+    with db.connect() as conn:
+        total = conn.execute('SELECT COUNT(*) FROM events WHERE start_day IS NOT NULL').fetchone()[0]
+    assert len(index) == total
+    for day in DAYS:
+        expected = set(db.get_events_in_range.__wrapped__(day, day)['id'].tolist())
+        assert set(index.at(day).tolist()) == expected, day
+
+def test_bulk_insert_then_single_writes(database):
+    db.add_events_bulk(bulk_rows(500))
+    get_interval_index()
+    db.add_event('단건', '2024-11-03', '2024-11-05', '#45B7D1')
+    db.add_events_bulk(bulk_rows(500, '두 번째'))
+    event_id = db.add_event('단건 2', '2024-11-10', '2024-11-12', '#45B7D1')
+    db.update_event(event_id, '단건 2', '2024-11-20', '2024-11-25', '#45B7D1', '')
+    db.delete_event(1)
+    assert_index_matches_db()
+
+    db.delete_all_events()
+    db.add_event('초기화 뒤', '2024-11-01', '2024-11-02', '#45B7D1')
+    assert_index_matches_db()
+
+def test_bulk_and_single_write_in_one_group_commit(database):
+    db.add_event('처음', '2024-11-01', '2024-11-01', '#45B7D1')
+    get_interval_index()
+
+    # 쓰기 스레드를 잠시 막아 두고 일괄 등록과 단건 등록이 한 트랜잭션으로 묶이게 함
+    # (막는 작업이 실행을 시작한 뒤에 넣어야 같은 묶음으로 가져가지 않음)
+    writer = db.get_pool().writer()
+    started, release = threading.Event(), threading.Event()
+    blocker = writer.submit(lambda conn: started.set() or release.wait())
+    started.wait()
+    importer = threading.Thread(target=db.add_events_bulk, args=(bulk_rows(10),))
+    importer.start()
+    while writer._jobs.qsize() < 1:
+        time.sleep(0.001)
+    single = db.add_event('같이 커밋', '2024-11-05', '2024-11-06', '#45B7D1', wait=False)
+    release.set()
+    blocker.result()
+    single.result()
+    importer.join()
+    assert_index_matches_db()
+
+def test_unparseable_dates(database):
+    # 'YYYY/MM/DD'처럼 해석하지 못하는 날짜는 일수가 NULL이라 기간 조회와 인덱스에서 모두 빠짐
+    db.add_event('정상', '2024-11-01', '2024-11-03', '#45B7D1')
+    get_interval_index()
+    event_id = db.add_event('잘못된 날짜', '2024/11/02', '2024/11/04', '#45B7D1')
+    assert_index_matches_db()
+    db.update_event(event_id, '고친 날짜', '2024-11-02', '2024-11-04', '#45B7D1', '')
+    assert_index_matches_db()
+    db.update_event(event_id, '다시 잘못됨', '2024/11/02', '2024/11/04', '#45B7D1', '')
+    assert_index_matches_db()
+    with db.connect() as conn:
+        stats = conn.execute('SELECT SUM(event_count), SUM(total_days) FROM event_stats').fetchone()
+    assert tuple(stats) == (2, 3)
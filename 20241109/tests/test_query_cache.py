@@ -0,0 +1,30 @@
+# tests/test_query_cache.py
+# 조회 캐시가 호출한 쪽마다 결과 사본을 돌려주는지 확인 (다른 세션이 고친 값이 보이지 않도록)
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    db.init_db()
+    yield
+    db.close_all_connections()
+
+def test_cached_stats_are_copied(database):
+    db.add_event('통계', '2024-11-01', '2024-11-03', '#45B7D1')
+    first = db.get_event_stats('2024-11-15')
+    first['by_month'].loc['2024-11', 'event_count'] = 100
+    first['by_color'].drop(index=first['by_color'].index, inplace=True)
+    first['total'] = 100
+
+    second = db.get_event_stats('2024-11-15')
+    assert second['total'] == 1
+    assert second['by_month'].loc['2024-11', 'event_count'] == 1
+    assert second['by_month'].loc['2024-11', 'total_days'] == 3
+    assert len(second['by_color']) == 1
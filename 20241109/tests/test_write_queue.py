@@ -0,0 +1,64 @@
+# tests/test_write_queue.py
+# 캘린더 드래그 변경 대기열이 rerun 없이도 정해진 시간 뒤에 저장되는지 확인
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sys
+import time
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    db.init_db()
+    yield
+    db.close_all_connections()
+
+def stored_dates(event_id):
+    with db.connect() as conn:
+        return tuple(conn.execute('SELECT start_date, end_date FROM events WHERE id = ?', (event_id,)).fetchone())
+
+def wait_for_dates(event_id, expected, timeout=5):
+    deadline = time.monotonic() + timeout
+    while stored_dates(event_id) != expected and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return stored_dates(event_id)
+
+def test_timed_flush(database):
+    event_id = db.add_event('드래그', '2024-11-01', '2024-11-02', '#45B7D1')
+    edit_queue = db.WriteQueue(flush_after=0.1)
+    edit_queue.put(event_id, '2024-11-03', '2024-11-04')
+    edit_queue.put(event_id, '2024-11-05', '2024-11-06')
+    assert stored_dates(event_id) == ('2024-11-01', '2024-11-02')
+    assert wait_for_dates(event_id, ('2024-11-05', '2024-11-06')) == ('2024-11-05', '2024-11-06')
+    assert len(edit_queue) == 0
+
+def test_discard_cancels_timed_flush(database):
+    event_id = db.add_event('취소', '2024-11-01', '2024-11-02', '#45B7D1')
+    edit_queue = db.WriteQueue(flush_after=0.1)
+    edit_queue.put(event_id, '2024-11-03', '2024-11-04')
+    edit_queue.discard()
+    time.sleep(0.3)
+    assert stored_dates(event_id) == ('2024-11-01', '2024-11-02')
+
+def test_failed_timed_flush_is_logged_and_retried(database, monkeypatch, caplog):
+    event_id = db.add_event('재시도', '2024-11-01', '2024-11-02', '#45B7D1')
+    update_event_dates = db.update_event_dates
+    failures = []
+
+    def failing_update(changes):
+        if not failures:
+            failures.append(1)
+            raise RuntimeError('저장 실패')
+        return update_event_dates(changes)
+
+    monkeypatch.setattr(db, 'update_event_dates', failing_update)
+    edit_queue = db.WriteQueue(flush_after=0.1)
+    with caplog.at_level('ERROR', logger='db'):
+        edit_queue.put(event_id, '2024-11-03', '2024-11-04')
+        assert wait_for_dates(event_id, ('2024-11-03', '2024-11-04')) == ('2024-11-03', '2024-11-04')
+    assert failures
+    assert any(record.exc_info and '자동 저장 실패' in record.getMessage() for record in caplog.records)
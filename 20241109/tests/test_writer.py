@@ -0,0 +1,44 @@
+# tests/test_writer.py
+# 쓰기 스레드가 연결을 열지 못해도 대기 중인 쓰기가 멈추지 않고, 다음 쓰기에서 새 스레드로 복구되는지 확인
+# 실행: 20241109 폴더에서 python -m pytest -q tests
+import os
+import sqlite3
+import sys
+import threading
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, 'DB_PATH', str(tmp_path / 'test.db'))
+    db.init_db()
+    yield
+    db.close_all_connections()
+
+def test_writer_connect_failure(database, monkeypatch):
+    pool = db.get_pool()
+    connect = pool._connect
+    failures = []
+
+    def failing_connect():
+        # 첫 쓰기 스레드의 연결만 실패시킴
+        if threading.current_thread().name == 'db-writer' and not failures:
+            failures.append(1)
+            raise sqlite3.OperationalError('database is locked')
+        return connect()
+
+    monkeypatch.setattr(pool, '_connect', failing_connect)
+    future = db.add_event('실패', '2024-11-01', '2024-11-02', '#45B7D1', wait=False)
+    with pytest.raises(sqlite3.OperationalError):
+        future.result(timeout=3)
+
+    # 끝난 쓰기 스레드는 다음 쓰기에서 새로 시작됨
+    event_id = db.add_event('복구', '2024-11-01', '2024-11-02', '#45B7D1', wait=False).result(timeout=3)
+    assert pool.writer().is_alive()
+    with db.connect() as conn:
+        titles = [row[0] for row in conn.execute('SELECT title FROM events')]
+    assert titles == ['복구']
+    assert event_id is not None
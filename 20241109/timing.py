@@ -0,0 +1,237 @@
+# timing.py
+# 실행 시간 계측 (DB 호출/SQL 문, 페이지의 데이터 준비와 그리기 구간)
+# 환경 변수로 켬: CALENDAR_TIMING=1
+#   CALENDAR_SLOW_MS: 이 시간(ms) 이상 걸린 작업은 경고 로그로 남김 (기본 200)
+#   CALENDAR_TIMING_LOG: 기록을 JSON Lines로 덧붙여 쓸 파일 경로
+# 꺼져 있으면 traced 함수와 SQL 실행에는 플래그 확인 한 번만 추가되고, span()은 빈 컨텍스트 관리자를 돌려줌
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import functools
+from collections import deque
+import pandas as pd
+
+ENABLED = os.environ.get('CALENDAR_TIMING', '') not in ('', '0')
+SLOW_MS = float(os.environ.get('CALENDAR_SLOW_MS', 200))
+LOG_PATH = os.environ.get('CALENDAR_TIMING_LOG') or None
+MAX_RECORDS = 1000      # 디버그 패널용으로 메모리에 남기는 최근 기록 수
+SQL_TEXT_LIMIT = 300    # 기록에 남기는 SQL 문 최대 길이
+SQL_NAME_LIMIT = 80     # 요약에서 같은 문장으로 묶는 기준 (앞부분 길이)
+
+logger = logging.getLogger(__name__)
+
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_log_file = None
+
+def configure(enabled=None, slow_ms=None, log_path=None):
+    # 실행 중에 설정 변경 (인자를 생략한 항목은 그대로 둠)
+    global ENABLED, SLOW_MS, LOG_PATH, _log_file
+    with _lock:
+        if enabled is not None:
+            ENABLED = bool(enabled)
+        if slow_ms is not None:
+            SLOW_MS = float(slow_ms)
+        if log_path is not None and log_path != LOG_PATH:
+            if _log_file is not None:
+                _log_file.close()
+                _log_file = None
+            LOG_PATH = log_path or None
+
+def record(kind, name, duration_ms, **fields):
+    # kind: 'db'(db.py 함수) / 'sql'(SQL 문) / 'span'(페이지 구간)
+    entry = {
+        'ts': time.time(),
+        'kind': kind,
+        'name': name,
+        'duration_ms': round(duration_ms, 3),
+        'thread': threading.current_thread().name,
+        **fields,
+    }
+    global _log_file
+    with _lock:
+        _records.append(entry)
+        if LOG_PATH is not None:
+            if _log_file is None:
+                _log_file = open(LOG_PATH, 'a', encoding='utf-8')
+            _log_file.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+            _log_file.flush()
+    if duration_ms >= SLOW_MS:
+        logger.warning('느린 작업 %s %s: %.1fms %s', kind, name, duration_ms, fields)
+    return entry
+
+class _Span:
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+
+    def set(self, **fields):
+        # 구간 안에서 알게 된 값(행 수 등)을 기록에 추가
+        self.fields.update(fields)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.fields['error'] = exc_type.__name__
+        record('span', self.name, (time.perf_counter() - self.started) * 1000, **self.fields)
+        return False
+
+class _NullSpan:
+    def set(self, **fields):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name, **fields):
+    # with span('gantt.figure', rows=len(df)): ... 형태로 구간 시간 기록
+    if not ENABLED:
+        return _NULL_SPAN
+    return _Span(name, fields)
+
+def _row_count(result):
+    if isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, (pd.DataFrame, list)):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], pd.DataFrame):
+        return len(result[0])
+    return None
+
+def traced(func):
+    # 함수 호출 시간과 결과 행 수를 기록하는 데코레이터 (이름: 모듈.함수)
+    # db.py 함수는 'db', 그 밖의 함수(그림/데이터 준비 등)는 'span'으로 기록
+    name = f'{func.__module__}.{func.__name__}'
+    kind = 'db' if func.__module__ == 'db' else 'span'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not ENABLED:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            record(kind, name, (time.perf_counter() - started) * 1000, error=type(e).__name__)
+            raise
+        rows = _row_count(result)
+        if rows is None:
+            record(kind, name, (time.perf_counter() - started) * 1000)
+        else:
+            record(kind, name, (time.perf_counter() - started) * 1000, rows=rows)
+        return result
+    return wrapper
+
+def _sql_text(sql):
+    text = ' '.join(sql.split())
+    return text if len(text) <= SQL_TEXT_LIMIT else text[:SQL_TEXT_LIMIT] + '...'
+
+def _record_sql(started, sql, cursor, error=None):
+    # SELECT는 실행 시점에 행 수를 알 수 없으므로 rowcount(-1)는 남기지 않음
+    text = _sql_text(sql)
+    fields = {'sql': text}
+    if error is not None:
+        fields['error'] = error
+    elif cursor.rowcount >= 0:
+        fields['rows'] = cursor.rowcount
+    record('sql', text[:SQL_NAME_LIMIT], (time.perf_counter() - started) * 1000, **fields)
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        if not ENABLED:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except Exception as e:
+            _record_sql(started, sql, self, type(e).__name__)
+            raise
+        _record_sql(started, sql, self)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        if not ENABLED:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except Exception as e:
+            _record_sql(started, sql, self, type(e).__name__)
+            raise
+        _record_sql(started, sql, self)
+        return self
+
+class TimedConnection(sqlite3.Connection):
+    # sqlite3.connect(factory=TimedConnection): conn.execute*와 cursor()로 실행하는 SQL 문마다 시간 기록
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        if not ENABLED:
+            return super().execute(sql, parameters)
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not ENABLED:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        if not ENABLED:
+            return super().commit()
+        started = time.perf_counter()
+        super().commit()
+        record('sql', 'COMMIT', (time.perf_counter() - started) * 1000, sql='COMMIT')
+
+def get_records(kind=None):
+    # 최근 기록 (오래된 것부터)
+    with _lock:
+        records = list(_records)
+    if kind is not None:
+        records = [entry for entry in records if entry['kind'] == kind]
+    return records
+
+def clear_records():
+    with _lock:
+        _records.clear()
+
+def summarize_records(records=None):
+    # 이름별 호출 수/합계/평균/최대 시간 (합계가 큰 순)
+    records = get_records() if records is None else records
+    if not records:
+        return pd.DataFrame(columns=['kind', 'name', 'calls', 'total_ms', 'mean_ms', 'max_ms'])
+    df = pd.DataFrame(records)
+    summary = df.groupby(['kind', 'name'])['duration_ms'].agg(
+        calls='count', total_ms='sum', mean_ms='mean', max_ms='max'
+    ).reset_index()
+    return summary.sort_values('total_ms', ascending=False, ignore_index=True)
+
+def show_debug_panel():
+    # 계측이 켜져 있을 때만 사이드바에 최근 기록 표시 (페이지 맨 끝에서 호출)
+    if not ENABLED:
+        return
+    import streamlit as st
+    records = get_records()
+    with st.sidebar.expander(f"⏱️ 실행 시간 ({len(records):,}건)"):
+        st.caption(f"{SLOW_MS:g}ms 이상은 느린 작업으로 표시합니다.")
+        st.dataframe(summarize_records(records), hide_index=True, use_container_width=True)
+        slow = [entry for entry in records if entry['duration_ms'] >= SLOW_MS]
+        if slow:
+            st.markdown(f"**느린 작업 {len(slow):,}건**")
+            st.dataframe(pd.DataFrame(slow[::-1]), hide_index=True, use_container_width=True)
+        if st.button("기록 지우기", key='timing_clear'):
+            clear_records()
+            st.rerun()